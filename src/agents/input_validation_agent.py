@@ -3,6 +3,7 @@ Input Validation Agent using GigaChat3.
 """
 
 import logging
+import re
 from typing import Any
 
 from src.agents.chains.output_parsers import ValidationParser
@@ -14,6 +15,10 @@ from src.prompts.validation_prompts import INPUT_VALIDATION_PROMPT
 
 logger = logging.getLogger(__name__)
 
+# All known injection patterns compiled into one alternation, so each input is
+# scanned in a single pass instead of one substring check per pattern.
+_INJECTION_MATCHER = re.compile("|".join(map(re.escape, INJECTION_PATTERNS)), re.IGNORECASE)
+
 
 class InputValidationAgent:
     """
@@ -67,12 +72,11 @@ class InputValidationAgent:
             raise InvalidInputError(msg)
 
         # Check injection patterns
-        input_lower = user_input.lower()
-
-        for pattern in INJECTION_PATTERNS:
-            if pattern.lower() in input_lower:
-                logger.warning(f"⚠️ Injection pattern detected: {pattern}")
-                raise PromptInjectionError(pattern)
+        match = _INJECTION_MATCHER.search(user_input)
+        if match:
+            pattern = match.group(0)
+            logger.warning(f"⚠️ Injection pattern detected: {pattern}")
+            raise PromptInjectionError(pattern)
 
         # ═══════════════════════════════════════════════════════════
         # STEP 2: LLM VALIDATION
@@ -2,32 +2,52 @@ import asyncio
 from dataclasses import dataclass
 
 from ...models.orchestrator_schemas import ClassificationResult, ResolveRequest, TaskType
+from .workers import (
+    materials_worker,
+    support_worker,
+    test_worker,
+    verification_worker,
+)
 from .workers.base_worker import BaseWorker, WorkerResult
-from .workers.materials_worker import MaterialsWorker
-from .workers.support_worker import SupportWorker
-from .workers.test_worker import TestWorker
-from .workers.verification_worker import VerificationWorker
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExecutionResult:
     main_result: WorkerResult
     support_result: WorkerResult | None
     agents_used: list[str]
 
 
+async def _run_main(
+    worker: BaseWorker, request: ResolveRequest, cls: ClassificationResult
+) -> WorkerResult:
+    """Запустить основной воркер с аргументами под его тип задачи."""
+    if cls.task_type is TaskType.VERIFICATION:
+        return await worker.run(
+            user_id=request.user_id,
+            question=cls.question,
+            user_answer=cls.user_answer,
+        )
+    # MATERIALS, TEST и fallback имеют одинаковую сигнатуру.
+    return await worker.run(
+        user_id=request.user_id,
+        topic=cls.topic,
+        user_level=request.user_level,
+    )
+
+
 class Executor:
     @staticmethod
     def _get_main_worker(task_type: TaskType) -> tuple[str, BaseWorker]:
-        if task_type == TaskType.MATERIALS:
-            return "materials", MaterialsWorker()
-        if task_type == TaskType.TEST:
-            return "test", TestWorker()
-        if task_type == TaskType.VERIFICATION:
-            return "verification", VerificationWorker()
-        if task_type == TaskType.SUPPORT:
-            return "support", SupportWorker()
-        return "materials", MaterialsWorker()
+        if task_type is TaskType.MATERIALS:
+            return "materials", materials_worker
+        if task_type is TaskType.TEST:
+            return "test", test_worker
+        if task_type is TaskType.VERIFICATION:
+            return "verification", verification_worker
+        if task_type is TaskType.SUPPORT:
+            return "support", support_worker
+        return "materials", materials_worker
 
     async def execute(
         self,
@@ -37,7 +57,7 @@ class Executor:
         main_name, main_worker = self._get_main_worker(cls.task_type)
         agents_used = [main_name]
 
-        if cls.task_type == TaskType.SUPPORT:
+        if cls.task_type is TaskType.SUPPORT:
             main_res = await main_worker.run(
                 user_id=request.user_id,
                 message=request.message,
@@ -46,47 +66,18 @@ class Executor:
                 main_result=main_res, support_result=None, agents_used=agents_used
             )
 
-        async def run_main() -> WorkerResult:
-            if cls.task_type == TaskType.MATERIALS:
-                return await main_worker.run(
-                    user_id=request.user_id,
-                    topic=cls.topic,
-                    user_level=request.user_level,
-                )
-            if cls.task_type == TaskType.TEST:
-                return await main_worker.run(
-                    user_id=request.user_id,
-                    topic=cls.topic,
-                    user_level=request.user_level,
-                )
-            if cls.task_type == TaskType.VERIFICATION:
-                return await main_worker.run(
-                    user_id=request.user_id,
-                    question=cls.question,
-                    user_answer=cls.user_answer,
-                )
-            return await main_worker.run(
-                user_id=request.user_id,
-                topic=cls.topic,
-                user_level=request.user_level,
-            )
-
         if not cls.include_support:
-            main_res = await run_main()
+            main_res = await _run_main(main_worker, request, cls)
             return ExecutionResult(
                 main_result=main_res, support_result=None, agents_used=agents_used
             )
 
-        support_worker = SupportWorker()
         agents_used.append("support")
 
-        async def run_support() -> WorkerResult:
-            return await support_worker.run(
-                user_id=request.user_id,
-                message=request.message,
-            )
-
-        main_res, supp_res = await asyncio.gather(run_main(), run_support())
+        main_res, supp_res = await asyncio.gather(
+            _run_main(main_worker, request, cls),
+            support_worker.run(user_id=request.user_id, message=request.message),
+        )
         return ExecutionResult(
             main_result=main_res, support_result=supp_res, agents_used=agents_used
         )
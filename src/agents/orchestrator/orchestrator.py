@@ -1,9 +1,15 @@
+import logging
 import time
 
 from ...models.orchestrator_schemas import ResolveRequest, ResolveResponse
+from ..registry import list_agents, load_agent
 from .aggregator import aggregate
 from .classifier import RequestClassifier
 from .executor import Executor
+from .workers import support_worker
+from .workers.base_worker import _get_session
+
+logger = logging.getLogger(__name__)
 
 
 class Orchestrator:
@@ -22,3 +28,24 @@ class Orchestrator:
 
 
 orchestrator = Orchestrator()
+
+
+async def warmup() -> None:
+    """Прогреть LLM-цепочки и HTTP-пул до первого боевого запроса.
+
+    Построение LangChain-раннаблов (LLM-клиенты, шаблоны, парсеры) и
+    установление TCP/TLS-соединения с воркерами выносятся из критического
+    пути первого пользовательского запроса.
+    """
+    for name in list_agents():
+        try:
+            load_agent(name)
+        except Exception as e:
+            logger.warning(f"⚠️ Agent warmup failed for '{name}': {e}")
+
+    try:
+        session = await _get_session()
+        async with session.get(f"{support_worker.base_url}/health") as response:
+            logger.info(f"🔥 Worker pool warmed up (health status {response.status})")
+    except Exception as e:
+        logger.warning(f"⚠️ Worker pool warmup failed: {e}")
@@ -0,0 +1,25 @@
+from .base_worker import BaseWorker, WorkerResult
+from .materials_worker import MaterialsWorker
+from .support_worker import SupportWorker
+from .test_worker import TestWorker
+from .verification_worker import VerificationWorker
+
+# Workers are stateless apart from their base URL, so a single instance of each
+# is shared across all requests instead of being re-created per call.
+materials_worker = MaterialsWorker()
+test_worker = TestWorker()
+verification_worker = VerificationWorker()
+support_worker = SupportWorker()
+
+__all__ = [
+    "BaseWorker",
+    "MaterialsWorker",
+    "SupportWorker",
+    "TestWorker",
+    "VerificationWorker",
+    "WorkerResult",
+    "materials_worker",
+    "support_worker",
+    "test_worker",
+    "verification_worker",
+]
@@ -1,15 +1,49 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
-import httpx
+import aiohttp
 
 from ....config import settings
+from ....core.cache.memory_cache import get_memory_cache
+from ....core.cache.redis_cache import get_redis_cache
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
-@dataclass
+
+@lru_cache(maxsize=2048)
+def _encode_payload(items: tuple[tuple[str, Any], ...]) -> bytes:
+    """Encode a payload (as sorted key/value pairs) to JSON bytes once.
+
+    Worker payloads are small flat dicts of strings and numbers, and the same
+    (topic, user_level) combinations repeat heavily, so the encoded bytes are
+    cached and reused instead of re-serialising per request.
+    """
+    return json.dumps(dict(items), ensure_ascii=False).encode()
+
+# A single shared session keeps the connection pool (and its keep-alive
+# sockets) alive across requests instead of re-establishing TCP per call.
+_session: aiohttp.ClientSession | None = None
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Return the shared :class:`aiohttp.ClientSession`, creating it lazily."""
+    global _session  # noqa: PLW0603
+    if _session is None or _session.closed:
+        timeout_seconds = getattr(settings, "timeout_s", 30)
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=timeout_seconds),
+        )
+    return _session
+
+
+@dataclass(frozen=True, slots=True)
 class WorkerResult:
     """
     Represents the result of a worker HTTP request.
@@ -79,6 +113,28 @@ class BaseWorker(ABC):
         payload: Dict[str, Any]
             JSON‑serialisable payload to send.
 
+        Returns
+        -------
+        WorkerResult
+            Normalised result of the request.
+        """
+        try:
+            body_out = _encode_payload(tuple(sorted(payload.items())))
+        except TypeError:
+            # Unhashable values cannot be cached; encode directly.
+            body_out = json.dumps(payload, ensure_ascii=False).encode()
+
+        return await self._post_raw(body_out)
+
+    async def _post_raw(self, body_out: bytes) -> WorkerResult:
+        """
+        Send pre-encoded JSON bytes to the worker's endpoint.
+
+        Parameters
+        ----------
+        body_out: bytes
+            Already serialised JSON request body.
+
         Returns
         -------
         WorkerResult
@@ -96,20 +152,69 @@ class BaseWorker(ABC):
 
         url = f"{self.base_url}{endpoint}"
 
-        # Use a sensible default timeout if the settings object does not provide one.
-        timeout_seconds = getattr(settings, "timeout_s", 30)
-
-        async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-            response = await client.post(url, json=payload)
+        session = await _get_session()
+        async with session.post(url, data=body_out, headers=_JSON_HEADERS) as response:
+            ok = 200 <= response.status < 300
+            body = await response.read()
 
-        ok = 200 <= response.status_code < 300
         try:
-            data = response.json()
+            data = json.loads(body)
         except Exception:
             data = None
 
         return WorkerResult(
             ok=ok,
-            content=data.get("content") if isinstance(data, dict) else response.text,
+            content=data.get("content")
+            if isinstance(data, dict)
+            else body.decode("utf-8", errors="replace"),
             raw=data if isinstance(data, dict) else None,
         )
+
+    async def _cached_post(
+        self, payload: dict[str, Any], *, cache_key: str, ttl: int = 3600
+    ) -> WorkerResult:
+        """
+        Send a POST request with a two-level response cache in front of it.
+
+        Informational endpoints (materials, tests, verification) produce the same
+        answer for the same inputs over short windows, so successful responses are
+        kept in the in-process L1 cache and shared across orchestrator instances
+        via Redis (L2). Personalised endpoints (support) must keep using
+        :meth:`_post` directly.
+
+        Parameters
+        ----------
+        payload: Dict[str, Any]
+            JSON‑serialisable payload to send.
+        cache_key: str
+            Key material identifying the response (e.g. ``"{topic}:{user_level}"``).
+            It should exclude fields the response does not depend on, such as
+            ``user_id``.
+        ttl: int
+            Cache lifetime in seconds.
+
+        Returns
+        -------
+        WorkerResult
+            Normalised result of the request, possibly served from cache.
+        """
+        key_hash = hashlib.blake2b(cache_key.encode(), digest_size=16).hexdigest()
+        key = f"worker:{self.endpoint}:{key_hash}"
+
+        memory = get_memory_cache()
+        entry = memory.get(key)
+        if entry is not None:
+            return WorkerResult(ok=True, content=entry["content"], raw=entry["raw"])
+
+        redis_cache = get_redis_cache()
+        entry = await redis_cache.get(key)
+        if entry is not None:
+            memory.set(key, entry, ttl=ttl)
+            return WorkerResult(ok=True, content=entry["content"], raw=entry["raw"])
+
+        result = await self._post(payload)
+        if result.ok:
+            entry = {"content": result.content, "raw": result.raw}
+            memory.set(key, entry, ttl=ttl)
+            await redis_cache.set(key, entry, ttl=ttl)
+        return result
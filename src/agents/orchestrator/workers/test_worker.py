@@ -13,4 +13,6 @@ class TestWorker(BaseWorker):
             "difficulty": user_level or "intermediate",
             "question_count": 5,
         }
-        return await self._post(payload)
+        # Generated tests depend on topic/difficulty only, not on the student.
+        cache_key = f"{payload['topic']}:{payload['difficulty']}"
+        return await self._cached_post(payload, cache_key=cache_key, ttl=3600)
@@ -14,4 +14,6 @@ class VerificationWorker(BaseWorker):
             "question": question or "",
             "user_answer": user_answer or "",
         }
-        return await self._post(payload)
+        # A verdict for the same question/answer pair is stable, so cache longer.
+        cache_key = f"{payload['question']}:{payload['user_answer']}"
+        return await self._cached_post(payload, cache_key=cache_key, ttl=86400)
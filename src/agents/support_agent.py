@@ -4,6 +4,10 @@ from langchain_core.runnables import Runnable
 
 from ..core.llm import get_llm
 
+# Системный промпт статичен (без интерполяции), чтобы провайдер мог
+# кэшировать общий префикс; состояние и сообщение студента передаются
+# отдельным human-сообщением в конце.
+
 SUPPORT_SYSTEM_PROMPT = (
     "Ты - эмпатичный помощник, который оказывает психологическую поддержку студентам,"
     "изучающим алгоритмы и структуры данных.\n"
@@ -14,12 +18,14 @@ SUPPORT_SYSTEM_PROMPT = (
     "- Предложить конкретные рекомендации по управлению стрессом\n"
     "- Помочь сохранить мотивацию к обучению\n"
     "\n"
-    "Эмоциональное состояние студента: {emotional_state}\n"
-    "Сообщение студента: {message}\n"
-    "\n"
     "Ответь тепло, поддерживающе и дай практические советы."
 )
 
+SUPPORT_INPUT = (
+    "Эмоциональное состояние студента: {emotional_state}\n"
+    "Сообщение студента: {message}"
+)
+
 
 def build_support_agent() -> Runnable:
     """Агент психологической поддержки."""
@@ -27,7 +33,7 @@ def build_support_agent() -> Runnable:
 
     prompt = ChatPromptTemplate.from_messages([
         ("system", SUPPORT_SYSTEM_PROMPT),
-        ("human", "Окажи поддержку."),
+        ("human", SUPPORT_INPUT),
     ])
 
     return prompt | llm | StrOutputParser()
@@ -8,24 +8,30 @@ from ..core.llm import get_llm
 # Промпты
 # =======================
 
+# Системные промпты статичны (без интерполяции), чтобы провайдер мог
+# кэшировать общий префикс между вызовами; все динамические данные
+# передаются отдельным human-сообщением в конце.
+
 PRIMARY_VERIFICATION_PROMPT = (
     "Ты — эксперт по проверке решений задач по алгоритмам и структурам данных.\n\n"
     "Твоя задача:\n"
     "1. Проанализировать ответ пользователя на вопрос.\n"
     "2. Сравнить с эталонным ответом.\n"
     "3. Определить, является ли ответ правильным.\n\n"
-    "ДАННЫЕ ДЛЯ ПРОВЕРКИ:\n"
-    "Вопрос: {question}\n"
-    "Эталонный ответ: {expected_answer}\n"
-    "Ответ пользователя: {user_answer}\n\n"
     "ВЫВОД:\n"
     "Верни строго JSON в формате:\n"
     '{{ "verdict": true/false }}'
 )
 
+PRIMARY_VERIFICATION_INPUT = (
+    "ДАННЫЕ ДЛЯ ПРОВЕРКИ:\n"
+    "Вопрос: {question}\n"
+    "Эталонный ответ: {expected_answer}\n"
+    "Ответ пользователя: {user_answer}"
+)
+
 SECONDARY_VERIFICATION_PROMPT = (
     "Ты — независимый, строгий и справедливый судья-эксперт по проверке ответов.\n\n"
-    "ПЕРВИЧНЫЙ ВЕРДИКТ: {primary_verdict}\n\n"
     "ТВОЯ ЗАДАЧА:\n"
     "1. Самостоятельно определить, каким должен быть правильный ответ на вопрос.\n"
     "2. Сравнить ответ пользователя со своим пониманием правильного ответа.\n"
@@ -36,9 +42,6 @@ SECONDARY_VERIFICATION_PROMPT = (
     "- verdict = false: если есть фактические ошибки, логические противоречия или ответ неполный\n"
     "- Оценивай СМЫСЛ, а не стиль, допускай перефразирование.\n"
     "- Игнорируй мелкие опечатки.\n\n"
-    "ДАННЫЕ ДЛЯ ОЦЕНКИ:\n"
-    "Вопрос: {question}\n"
-    "Ответ пользователя: {user_answer}\n\n"
     "ВЫВОД:\n"
     "Верни СТРОГО валидный JSON без дополнительного текста:\n"
     "{{\n"
@@ -49,6 +52,13 @@ SECONDARY_VERIFICATION_PROMPT = (
     "}}"
 )
 
+SECONDARY_VERIFICATION_INPUT = (
+    "ПЕРВИЧНЫЙ ВЕРДИКТ: {primary_verdict}\n\n"
+    "ДАННЫЕ ДЛЯ ОЦЕНКИ:\n"
+    "Вопрос: {question}\n"
+    "Ответ пользователя: {user_answer}"
+)
+
 # =======================
 # Агенты
 # =======================
@@ -59,7 +69,7 @@ def build_verification_agent() -> Runnable:
     llm = get_llm(use_gigachat3=True)
     prompt = ChatPromptTemplate.from_messages([
         ("system", PRIMARY_VERIFICATION_PROMPT),
-        ("human", "Проверь ответ на тест."),
+        ("human", PRIMARY_VERIFICATION_INPUT),
     ])
     return prompt | llm | StrOutputParser()
 
@@ -69,6 +79,6 @@ def build_secondary_verification_agent() -> Runnable:
     llm = get_llm(use_gigachat3=False)
     prompt = ChatPromptTemplate.from_messages([
         ("system", SECONDARY_VERIFICATION_PROMPT),
-        ("human", "Проверь оценку."),
+        ("human", SECONDARY_VERIFICATION_INPUT),
     ])
     return prompt | llm | StrOutputParser()
@@ -3,95 +3,229 @@ Configuration management for Materials Agent v2.
 Loads from .env file with defaults.
 """
 
-from functools import lru_cache
-from pathlib import Path
-from typing import Literal
+import os
+
+# Must be set before pydantic is imported: skips pydantic-core's self-validation
+# of every generated CoreSchema (~20 models here), a pure startup-CPU cost.
+os.environ.setdefault("PYDANTIC_SKIP_VALIDATING_CORE_SCHEMAS", "true")
+
+import re  # noqa: E402
+import threading  # noqa: E402
+from dataclasses import dataclass  # noqa: E402
+from functools import cached_property, lru_cache  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import TYPE_CHECKING, Any, Literal  # noqa: E402
+
+from collections.abc import Mapping  # noqa: E402
+from typing import ClassVar  # noqa: E402
+
+from dotenv import dotenv_values  # noqa: E402
+from pydantic import Field, TypeAdapter, ValidationError, model_validator  # noqa: E402
+from pydantic_core import PydanticUndefined  # noqa: E402
+from pydantic_settings import (  # noqa: E402
+    BaseSettings,
+    DotEnvSettingsSource,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
+
+if TYPE_CHECKING:
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+
+class CachedDotEnvSettingsSource(DotEnvSettingsSource):
+    """DotEnv source that parses each env file once per mtime.
+
+    Every BaseSettings subclass instantiation re-reads env_file by default;
+    with ~20 sub-settings that is ~20 opens + tokenizations of the same .env.
+    The parsed mapping is shared here, invalidated when the file changes.
+    """
 
-from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+    _cache: ClassVar[dict[tuple[str, float], Mapping[str, str | None]]] = {}
+
+    def _read_env_files(self) -> Mapping[str, str | None]:
+        try:
+            mtime = os.path.getmtime(str(self.env_file))
+        except (OSError, TypeError):
+            mtime = 0.0
+        key = (str(self.env_file), mtime)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = super()._read_env_files()
+            self._cache[key] = cached
+        return cached
+
+
+# Default sequences are hoisted to shared immutable constants so model builds
+# reference one interned tuple instead of allocating a fresh list each time.
+_DEFAULT_SEPARATORS = ("\n\n", "\n", ". ", " ", "")
+_DEFAULT_FALLBACK_URLS = ("https://4get.bloat.cat", "https://4get.lunar.icu")
+_DEFAULT_FALLBACK_SCRAPERS = ("bing", "duckduckgo", "google")
+_DEFAULT_BLACKLIST = ("pinterest.com", "quora.com", "forbes.com", "medium.com")
+_DEFAULT_USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
+)
+_DEFAULT_CONTENT_SELECTORS = ("article", "main", ".content", ".post-content", "body")
+_DEFAULT_REMOVE_TAGS = ("script", "style", "nav", "header", "footer", "aside", "iframe")
+_DEFAULT_INJECTION_PATTERNS = (
+    "ignore previous",
+    "system prompt",
+    "__import__",
+    "eval(",
+    "exec(",
+    "<script>",
+)
+_DEFAULT_SQL_PATTERNS = ("DROP TABLE", "DELETE FROM", "INSERT INTO", "UPDATE SET")
+_DEFAULT_SPACY_ENTITY_TYPES = ("PERSON", "ORG", "GPE", "NORP", "FAC", "LOC")
+_DEFAULT_CORS_ORIGINS = ("http://localhost:3000", "https://example.com")
+_DEFAULT_CORS_METHODS = ("GET", "POST", "PUT", "DELETE")
+_DEFAULT_SEARCH_PRIORITIES = {
+    "edu": 2.0,
+    "org": 1.5,
+    "gov": 1.5,
+    "wiki": 1.2,
+    "habr": 1.0,
+    "stackoverflow": 0.8,
+    "com": 0.5,
+    "ru": 2.5,
+}
 
 
 class BaseNestedSettings(BaseSettings):
     model_config = SettingsConfigDict(
-        env_file=".env", env_file_encoding="utf-8", case_sensitive=False, extra="ignore"
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        defer_build=True,
+        # Sub-settings are static after init: never re-validate (and thus
+        # never deep-copy) already-constructed instances.
+        revalidate_instances="never",
+        validate_assignment=False,
+        frozen=True,
     )
 
+    def __hash__(self) -> int:
+        # Identity hash: there is one cached instance per process, and the
+        # value-based hash pydantic derives for frozen models would choke on
+        # dict-typed fields. This is what lets consumers @lru_cache on a
+        # settings section.
+        return hash(id(self))
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        return (
+            init_settings,
+            env_settings,
+            CachedDotEnvSettingsSource(settings_cls),
+            file_secret_settings,
+        )
+
 
 class LLMSettings(BaseNestedSettings):
     """LLM provider configuration."""
 
     # GigaChat-2-Max (Expensive, High Quality)
     gigachat_api_key: str = Field(description="GigaChat API Key")
-    gigachat_model: str = Field("GigaChat/GigaChat-2-Max", description="GigaChat model name")
-    gigachat_base_url: str = Field(
-        "https://foundation-models.api.cloud.ru/v1", description="GigaChat API base URL"
-    )
-    gigachat_temperature: float = Field(0.2, description="Temperature for GigaChat")
-    gigachat_max_tokens: int = Field(4096, description="Max tokens for GigaChat")
-    gigachat_timeout_s: float = Field(60.0, description="GigaChat timeout in seconds")
+    gigachat_model: str = "GigaChat/GigaChat-2-Max"
+    gigachat_base_url: str = "https://foundation-models.api.cloud.ru/v1"
+    gigachat_temperature: float = 0.2
+    gigachat_max_tokens: int = 4096
+    gigachat_timeout_s: float = 60.0
 
     # GigaChat3 (Free, Fast)
     # gigachat3_model: str = Field("ai-sage/GigaChat3-10B-A1.8B", description="GigaChat3 model")
-    gigachat3_model: str = Field("openai/gpt-oss-120b", description="GigaChat3 model")
-    gigachat3_temperature: float = Field(0.1, description="Temperature for GigaChat3")
-    gigachat3_max_tokens: int = Field(2048, description="Max tokens for GigaChat3")
-    gigachat3_timeout_s: float = Field(10.0, description="GigaChat3 timeout in seconds")
+    gigachat3_model: str = "openai/gpt-oss-120b"
+    gigachat3_temperature: float = 0.1
+    gigachat3_max_tokens: int = 2048
+    gigachat3_timeout_s: float = 10.0
 
 
 class ToTSettings(BaseNestedSettings):
     """Tree-of-Thoughts configuration."""
 
-    tot_max_depth: int = Field(5, description="Max ToT tree depth")
-    tot_branching_factor: int = Field(3, description="Number of branches per node")
-    tot_completeness_threshold: float = Field(0.85, description="Goal completeness threshold")
-    tot_min_iterations: int = Field(2, description="Minimum iterations before termination")
-    tot_promise_threshold: float = Field(0.3, description="Min promise score to continue")
-    tot_dead_end_relevance: float = Field(0.4, description="Min relevance for dead-end detection")
-    tot_dead_end_quality: float = Field(0.3, description="Min quality for dead-end detection")
+    tot_max_depth: int = 5
+    tot_branching_factor: int = 3
+    tot_completeness_threshold: float = 0.85
+    tot_min_iterations: int = 2
+    tot_promise_threshold: float = 0.3
+    tot_dead_end_relevance: float = 0.4
+    tot_dead_end_quality: float = 0.3
 
 
 class ContentGuardSettings(BaseNestedSettings):
     """Content Guard Layer configuration."""
 
-    content_guard_enabled: bool = Field(True, description="Enable Content Guard")
+    content_guard_enabled: bool = True
 
     # Toxicity Check
-    toxicity_threshold: float = Field(0.3, description="Toxicity score threshold")
-    toxicity_batch_size: int = Field(5, description="Batch size for toxicity checks")
-    toxicity_timeout_s: float = Field(5.0, description="Toxicity check timeout")
+    toxicity_threshold: float = 0.3
+    toxicity_batch_size: int = 5
+    toxicity_timeout_s: float = 5.0
 
     # Policy Check
-    policy_check_enabled: bool = Field(True, description="Enable policy compliance check")
-    policy_check_timeout_s: float = Field(5.0, description="Policy check timeout")
+    policy_check_enabled: bool = True
+    policy_check_timeout_s: float = 5.0
 
     # Content Sanitization
-    sanitize_remove_urls: bool = Field(True, description="Remove URLs from content")
-    sanitize_remove_emails: bool = Field(True, description="Remove emails from content")
-    sanitize_max_length_per_doc: int = Field(3000, description="Max chars per document")
+    sanitize_remove_urls: bool = True
+    sanitize_remove_emails: bool = True
+    sanitize_max_length_per_doc: int = 3000
 
     # Quality Gate
-    min_content_length: int = Field(100, description="Minimum content length")
-    max_content_length: int = Field(8000, description="Maximum content length")
-    min_sentence_count: int = Field(3, description="Minimum sentence count")
+    min_content_length: int = 100
+    max_content_length: int = 8000
+    min_sentence_count: int = 3
 
 
+@dataclass(slots=True, frozen=True)
 class ChromaDBSettings:
-    """ChromaDB vector store configuration."""
+    """ChromaDB vector store configuration (plain config bucket, no validation)."""
 
-    persist_directory: Path = Field(
-        default=Path("./data/chroma"), description="ChromaDB persistence directory"
-    )
-    collection_name: str = Field(default="aisd_materials", description="Main collection name")
-    working_memory_collection: str = Field(
-        default="agent_working_memory", description="Working memory collection name"
-    )
-    procedural_memory_collection: str = Field(
-        default="agent_procedural_memory", description="Procedural memory collection name"
-    )
+    persist_directory: Path = Path("./data/chroma")
+    collection_name: str = "aisd_materials"
+    working_memory_collection: str = "agent_working_memory"
+    procedural_memory_collection: str = "agent_procedural_memory"
 
 
+@dataclass(slots=True, frozen=True)
 class ChunkingSettings:
-    """Document chunking configuration for text splitting and embedding."""
+    """Document chunking configuration (plain config bucket, no validation)."""
+
+    chunk_size: int = 1000
+    chunk_overlap: int = 200
+    pdf_chunk_size: int = 1000
+    pdf_chunk_overlap: int = 200
+    chunking_strategy: Literal["fixed", "recursive", "semantic"] = "recursive"
+    separators: tuple[str, ...] = _DEFAULT_SEPARATORS
+    min_chunk_size: int = 100
+
+
+_CHUNKING_OVERRIDE_FIELDS = frozenset({
+    "chunk_size",
+    "chunk_overlap",
+    "pdf_chunk_size",
+    "pdf_chunk_overlap",
+})
+
+
+class VectorStoreSettings(BaseNestedSettings):
+    """Vector store and embedding configuration."""
+
+    # ChromaDB
+    persist_directory: Path = Path("./data/chroma")
+    collection_name: str = "aisd_materials"
+    working_memory_collection: str = "agent_working_memory"
+    procedural_memory_collection: str = "agent_procedural_memory"
 
     # Default text chunking
     chunk_size: int = Field(
@@ -116,30 +250,21 @@ class ChunkingSettings:
     )
 
     # Advanced chunking options
-    chunking_strategy: Literal["fixed", "recursive", "semantic"] = Field(
-        default="recursive",
-        description="Chunking strategy: fixed (character-based), recursive (respects structure), semantic (meaning-based)",
-    )
+    chunking_strategy: Literal["fixed", "recursive", "semantic"] = "recursive"
 
-    separators: list[str] = Field(
-        default=["\n\n", "\n", ". ", " ", ""],
-        description="Separators for recursive chunking, in order of preference",
-    )
+    separators: tuple[str, ...] = _DEFAULT_SEPARATORS
 
     min_chunk_size: int = Field(
         default=100, description="Minimum chunk size to avoid too-small chunks", ge=50
     )
 
-    @field_validator("chunk_overlap", "pdf_chunk_overlap")
-    @classmethod
-    def validate_overlap(cls, v: int, info) -> int:
-        """Ensure overlap is smaller than chunk size."""
-        info.field_name.replace("_overlap", "_size")
-        # This will be validated after all fields are set
-        return v
-
-    def model_post_init(self, __context) -> None:
-        """Validate overlap relative to chunk size after initialization."""
+    @model_validator(mode="after")
+    def validate_overlap(self):
+        """Validate overlap against chunk size, only when the env overrides them."""
+        if self.model_fields_set.isdisjoint(_CHUNKING_OVERRIDE_FIELDS):
+            # Defaults (overlap 200 < size 1000) are known-safe; skip the
+            # checks on the common default path.
+            return self
         if self.chunk_overlap >= self.chunk_size:
             raise ValueError(
                 f"chunk_overlap ({self.chunk_overlap}) must be less than chunk_size ({self.chunk_size})"
@@ -148,360 +273,385 @@ class ChunkingSettings:
             raise ValueError(
                 f"pdf_chunk_overlap ({self.pdf_chunk_overlap}) must be less than pdf_chunk_size ({self.pdf_chunk_size})"
             )
+        return self
 
 
-class VectorStoreSettings(BaseNestedSettings, ChromaDBSettings, ChunkingSettings):
-    """Vector store and embedding configuration."""
+class EmbeddingSettings(BaseNestedSettings):
+    """Shared semantic embedding configuration.
 
-    semantic_embedding_model: str = Field(
-        default="sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
-        description="Embedding model for semantic search",
-    )
-    # chroma: ChromaDBSettings = Field(default_factory=ChromaDBSettings)
-    # chunking: ChunkingSettings = Field(default_factory=ChunkingSettings)
+    Раньше VectorStoreSettings и AdaptiveRAGSettings держали по копии
+    semantic_embedding_model с одинаковым дефолтом; единая секция
+    гарантирует, что тяжёлая модель загружается в процесс ровно один раз.
+    """
+
+    semantic_embedding_model: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+
+    @cached_property
+    def embeddings(self) -> "HuggingFaceEmbeddings":
+        """Lazily loaded shared embedder (one SentenceTransformer per process)."""
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        return HuggingFaceEmbeddings(model_name=self.semantic_embedding_model)
 
 
 class AdaptiveRAGSettings(BaseNestedSettings):
     """Adaptive RAG configuration."""
 
-    adaptive_simple_threshold: int = Field(20, description="Simple query char threshold")
-    adaptive_complex_threshold: int = Field(50, description="Complex query char threshold")
+    adaptive_simple_threshold: int = 20
+    adaptive_complex_threshold: int = 50
 
-    rag_top_k: int = Field(5, description="Top K documents to retrieve")
-    rag_timeout_s: float = Field(5.0, description="RAG retrieval timeout")
+    rag_top_k: int = 5
+    rag_timeout_s: float = 5.0
 
     # TF-IDF
-    tfidf_model_path: str = Field("./models/tfidf_model.pkl", description="TF-IDF model path")
-    tfidf_update_interval_s: int = Field(86400, description="TF-IDF update interval")
-    tfidf_rebuild_on_missing: bool = Field(True, description="Rebuild TF-IDF if missing")
+    tfidf_model_path: str = "./models/tfidf_model.pkl"
+    tfidf_update_interval_s: int = 86400
+    tfidf_rebuild_on_missing: bool = True
 
     # Semantic Search
-    semantic_embedding_model: str = Field(
-        "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
-        description="Embedding model for semantic search",
-    )
-    semantic_extended_timeout_s: float = Field(10.0, description="Extended semantic timeout")
+    semantic_extended_timeout_s: float = 10.0
 
     # Hybrid Search (RRF)
-    rrf_k_constant: int = Field(60, description="RRF constant")
-    adaptive_tfidf_rebuild_on_missing: bool = Field(True, description="Rebuild TF-IDF if missing")
-    adaptive_tfidf_model_path: str = Field("./data/models/tfidf_model.pkl", description="TF-IDF model path")
+    rrf_k_constant: int = 60
+    adaptive_tfidf_rebuild_on_missing: bool = True
+    adaptive_tfidf_model_path: str = "./data/models/tfidf_model.pkl"
 
 
 class CorrectiveRAGSettings(BaseNestedSettings):
     """Corrective RAG configuration."""
 
-    corrective_enabled: bool = Field(True, description="Enable Corrective RAG")
-    corrective_min_relevance: float = Field(0.6, description="Min relevance score")
-    corrective_batch_size: int = Field(5, description="Batch size for relevance checks")
-    corrective_timeout_s: float = Field(5.0, description="Corrective RAG timeout")
-    corrective_min_coverage: float = Field(0.6, description="Min concept coverage")
-    corrective_min_docs_after_filter: int = Field(3, description="Min docs after filtering")
+    corrective_enabled: bool = True
+    corrective_min_relevance: float = 0.6
+    corrective_batch_size: int = 5
+    corrective_timeout_s: float = 5.0
+    corrective_min_coverage: float = 0.6
+    corrective_min_docs_after_filter: int = 3
 
 
 class WebSearchSettings(BaseNestedSettings):
     """Web search configuration."""
 
-    web_search_enabled: bool = Field(True, description="Enable web search")
+    web_search_enabled: bool = True
 
     # Primary Instance
-    web_search_base_url: str = Field("https://4get.bloat.cat", description="4get base URL")
-    web_search_scraper: str = Field("google", description="Primary scraper")
+    web_search_base_url: str = "https://4get.bloat.cat"
+    web_search_scraper: str = "google"
 
     # Fallback Instances
-    web_search_fallback_urls: list[str] = Field(
-        ["https://4get.bloat.cat", "https://4get.lunar.icu"],
-        description="Fallback 4get URLs",
-    )
-    web_search_fallback_scrapers: list[str] = Field(
-        ["bing", "duckduckgo", "google"], description="Fallback scrapers"
-    )
+    web_search_fallback_urls: tuple[str, ...] = _DEFAULT_FALLBACK_URLS
+    web_search_fallback_scrapers: tuple[str, ...] = _DEFAULT_FALLBACK_SCRAPERS
 
     # Search Parameters
-    web_search_results_limit: int = Field(5, description="Max search results")
-    web_search_timeout_s: float = Field(60.0, description="Web search timeout")
-    web_search_retry_count: int = Field(2, description="Retry count")
-
-    # Domain Priorities
-    web_search_priority_edu: float = Field(2.0, description=".edu priority")
-    web_search_priority_org: float = Field(1.5, description=".org priority")
-    web_search_priority_gov: float = Field(1.5, description=".gov priority")
-    web_search_priority_wiki: float = Field(1.2, description="Wikipedia priority")
-    web_search_priority_habr: float = Field(1.0, description="Habr priority")
-    web_search_priority_stackoverflow: float = Field(0.8, description="Stack Overflow priority")
-    web_search_priority_com: float = Field(0.5, description=".com priority")
-    web_search_priority_ru: float = Field(2.5, description=".ru priority")
+    web_search_results_limit: int = 5
+    web_search_timeout_s: float = 60.0
+    web_search_retry_count: int = 2
 
-    # Blacklist
-    web_search_blacklist: list[str] = Field(
-        ["pinterest.com", "quora.com", "forbes.com", "medium.com"],
-        description="Blacklisted domains",
+    # Domain Priorities (single map instead of one field per domain)
+    web_search_priorities: dict[str, float] = Field(
+        default_factory=lambda: dict(_DEFAULT_SEARCH_PRIORITIES)
     )
 
+    # Blacklist
+    web_search_blacklist: tuple[str, ...] = _DEFAULT_BLACKLIST
+
     # Query Optimization
-    web_search_add_context: bool = Field(True, description="Add context to queries")
-    web_search_context_suffix: str = Field(
-        "алгоритмы обучение программирование", description="Query context suffix"
-    )
-    web_search_deduplicate_threshold: float = Field(0.85, description="Dedup threshold")
+    web_search_add_context: bool = True
+    web_search_context_suffix: str = "алгоритмы обучение программирование"
+    web_search_deduplicate_threshold: float = 0.85
+
+    def model_post_init(self, context: Any, /) -> None:
+        """Overlay legacy WEB_SEARCH_PRIORITY_<DOMAIN> env vars onto the map.
+
+        Сохраняет обратную совместимость со старыми пер-доменными
+        переменными окружения после перехода на единый словарь.
+        """
+        env = _env_values()
+        for key in _DEFAULT_SEARCH_PRIORITIES:
+            raw = env.get(f"web_search_priority_{key}")
+            if raw is not None:
+                self.web_search_priorities[key] = float(raw)
+
+    @cached_property
+    def blacklist_set(self) -> frozenset[str]:
+        """Blacklisted hosts as a frozenset for O(1) exact-host membership."""
+        return frozenset(self.web_search_blacklist)
+
+    @cached_property
+    def blacklist_suffixes(self) -> tuple[str, ...]:
+        """Dotted suffix forms for subdomain matches (e.g. www.quora.com)."""
+        return tuple(f".{domain}" for domain in self.web_search_blacklist)
+
+    def is_blacklisted(self, host: str) -> bool:
+        """Check a host against the blacklist with C-level set/suffix lookups."""
+        return host in self.blacklist_set or host.endswith(self.blacklist_suffixes)
 
 
 class WebScraperSettings(BaseNestedSettings):
     """Web scraping configuration."""
 
-    web_content_fetch_enabled: bool = Field(True, description="Enable web content fetching")
-    web_content_max_length: int = Field(8000, description="Max content length")
-    web_content_min_length: int = Field(300, description="Min content length")
-    web_content_timeout_s: float = Field(5.0, description="Fetch timeout")
-    web_content_extended_timeout_s: float = Field(10.0, description="Extended timeout")
-    web_content_batch_size: int = Field(5, description="Batch size for fetching")
-    web_content_retry_count: int = Field(2, description="Retry count")
-
-    web_content_user_agents: list[str] = Field(
-        [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
-        ],
-        description="User agents for rotation",
-    )
+    web_content_fetch_enabled: bool = True
+    web_content_max_length: int = 8000
+    web_content_min_length: int = 300
+    web_content_timeout_s: float = 5.0
+    web_content_extended_timeout_s: float = 10.0
+    web_content_batch_size: int = 5
+    web_content_retry_count: int = 2
 
-    web_content_selectors: list[str] = Field(
-        ["article", "main", ".content", ".post-content", "body"],
-        description="CSS selectors for content",
-    )
-    web_content_remove_tags: list[str] = Field(
-        ["script", "style", "nav", "header", "footer", "aside", "iframe"],
-        description="Tags to remove",
-    )
+    web_content_user_agents: tuple[str, ...] = _DEFAULT_USER_AGENTS
+
+    web_content_selectors: tuple[str, ...] = _DEFAULT_CONTENT_SELECTORS
+    web_content_remove_tags: tuple[str, ...] = _DEFAULT_REMOVE_TAGS
 
 
 class MemorySettings(BaseNestedSettings):
     """Memory configuration."""
 
-    chroma_host: str = Field("localhost", description="ChromaDB host")
-    chroma_port: int = Field(8000, description="ChromaDB port")
-    chroma_persist_directory: str = Field(".chromadb", description="ChromaDB persist dir")
+    chroma_host: str = "localhost"
+    chroma_port: int = 8000
+    chroma_persist_directory: str = ".chromadb"
 
     # Collections
-    chroma_rag_collection: str = Field("aisd_materials", description="RAG collection name")
-    chroma_working_memory_collection: str = Field(
-        "agent_working_memory", description="Working memory collection"
-    )
-    chroma_procedural_memory_collection: str = Field(
-        "agent_procedural_memory", description="Procedural memory collection"
-    )
+    chroma_rag_collection: str = "aisd_materials"
+    chroma_working_memory_collection: str = "agent_working_memory"
+    chroma_procedural_memory_collection: str = "agent_procedural_memory"
 
     # Working Memory
-    memory_working_ttl_hours: int = Field(1, description="Working memory TTL")
-    memory_working_cleanup_interval_s: int = Field(3600, description="Cleanup interval")
+    memory_working_ttl_hours: int = 1
+    memory_working_cleanup_interval_s: int = 3600
 
     # Procedural Memory
-    memory_procedural_max_patterns: int = Field(1000, description="Max patterns")
-    memory_procedural_min_success_score: float = Field(0.8, description="Min success score")
-    memory_procedural_min_usage_for_save: int = Field(1, description="Min usage to save")
+    memory_procedural_max_patterns: int = 1000
+    memory_procedural_min_success_score: float = 0.8
+    memory_procedural_min_usage_for_save: int = 1
 
     # Fallback
-    memory_use_sqlite_backup: bool = Field(True, description="Use SQLite backup")
-    memory_use_in_memory_fallback: bool = Field(True, description="Use in-memory fallback")
+    memory_use_sqlite_backup: bool = True
+    memory_use_in_memory_fallback: bool = True
 
 
 class CacheSettings(BaseNestedSettings):
     """Cache configuration."""
 
-    redis_enabled: bool = Field(False, description="Enable Redis cache")
-    redis_host: str = Field("localhost", description="Redis host")
-    redis_port: int = Field(6379, description="Redis port")
-    redis_db: int = Field(0, description="Redis DB")
-    redis_password: str | None = Field(None, description="Redis password")
-    redis_timeout_s: float = Field(2.0, description="Redis timeout")
+    redis_enabled: bool = False
+    redis_host: str = "localhost"
+    redis_port: int = 6379
+    redis_db: int = 0
+    redis_password: str | None = None
+    redis_timeout_s: float = 2.0
+
+    # Default TTL for cached entries
+    cache_ttl_seconds: int = 3600
+
+    # Per-operation budget: a degraded Redis degrades to a cache miss
+    # instead of blocking request handlers.
+    cache_op_timeout_ms: int = 50
+
+    # On-disk cache for deterministic LLM calls (see LLMRouter)
+    llm_cache_db: str = "./data/llm_cache.db"
 
     # Cache TTLs
-    cache_web_search_ttl: int = Field(86400, description="Web search cache TTL")
-    cache_web_content_ttl: int = Field(604800, description="Web content cache TTL")
-    cache_rag_results_ttl: int = Field(3600, description="RAG results cache TTL")
+    cache_web_search_ttl: int = 86400
+    cache_web_content_ttl: int = 604800
+    cache_rag_results_ttl: int = 3600
+
+    @cached_property
+    def redis_url(self) -> str:
+        """Connection URL assembled once from the host/port/db/password parts."""
+        auth = f":{self.redis_password}@" if self.redis_password else ""
+        return f"redis://{auth}{self.redis_host}:{self.redis_port}/{self.redis_db}"
 
 
 class DataBaseModel(BaseNestedSettings):
     """Database configuration."""
 
-    database_url: str = Field("sqlite+aiosqlite:///./app.db", description="Database URL")
-    database_echo: bool = Field(False, description="Echo SQL queries")
+    database_url: str = "sqlite+aiosqlite:///./app.db"
+    database_echo: bool = False
 
     # Backup
-    db_backup_enabled: bool = Field(True, description="Enable DB backup")
-    db_backup_path: str = Field("./backups/db", description="Backup path")
-    db_backup_interval_s: int = Field(86400, description="Backup interval")
+    db_backup_enabled: bool = True
+    db_backup_path: str = "./backups/db"
+    db_backup_interval_s: int = 86400
 
     # JSON Fallback
-    db_json_fallback_enabled: bool = Field(True, description="Enable JSON fallback")
-    db_json_fallback_path: str = Field("./backups/generations", description="JSON fallback path")
+    db_json_fallback_enabled: bool = True
+    db_json_fallback_path: str = "./backups/generations"
 
     # Retry
-    db_retry_count: int = Field(2, description="Retry count")
-    db_retry_delay_ms: int = Field(100, description="Retry delay")
+    db_retry_count: int = 2
+    db_retry_delay_ms: int = 100
 
 
 class ValidationSettings(BaseNestedSettings):
     """Input validation configuration."""
 
-    validation_enabled: bool = Field(True, description="Enable validation")
-    validation_timeout_s: float = Field(5.0, description="Validation timeout")
-    validation_max_input_length: int = Field(200, description="Max input length")
-    validation_min_input_length: int = Field(5, description="Min input length")
+    validation_enabled: bool = True
+    validation_timeout_s: float = 5.0
+    validation_max_input_length: int = 200
+    validation_min_input_length: int = 5
 
     # Injection Detection
-    validation_injection_patterns: list[str] = Field(
-        ["ignore previous", "system prompt", "__import__", "eval(", "exec(", "<script>"],
-        description="Injection patterns",
-    )
+    validation_injection_patterns: tuple[str, ...] = _DEFAULT_INJECTION_PATTERNS
 
     # SQL Injection Detection
-    validation_sql_patterns: list[str] = Field(
-        ["DROP TABLE", "DELETE FROM", "INSERT INTO", "UPDATE SET"],
-        description="SQL injection patterns",
-    )
+    validation_sql_patterns: tuple[str, ...] = _DEFAULT_SQL_PATTERNS
+
+    @cached_property
+    def injection_matcher(self) -> re.Pattern[str]:
+        """Injection patterns compiled once into a single alternation."""
+        return re.compile(
+            "|".join(map(re.escape, self.validation_injection_patterns)), re.IGNORECASE
+        )
+
+    @cached_property
+    def sql_matcher(self) -> re.Pattern[str]:
+        """SQL patterns compiled once into a single alternation."""
+        return re.compile("|".join(map(re.escape, self.validation_sql_patterns)), re.IGNORECASE)
+
+    def scan(self, text: str) -> str | None:
+        """Scan text in one compiled pass and return the matched pattern, if any.
+
+        Replaces the O(patterns × text) Python loop of substring checks with
+        two C-level regex traversals.
+        """
+        match = self.injection_matcher.search(text) or self.sql_matcher.search(text)
+        return match.group(0) if match else None
 
 
 class ConceptExtractionSettings(BaseNestedSettings):
     """Concept extraction configuration."""
 
-    concept_keybert_enabled: bool = Field(True, description="Enable KeyBERT")
-    concept_keybert_model: str = Field(
-        "sentence-transformers/paraphrase-multilingual-mpnet-base-v2", description="KeyBERT model"
-    )
-    concept_keybert_top_n: int = Field(10, description="Top N concepts")
+    concept_keybert_enabled: bool = True
+    concept_keybert_model: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+    concept_keybert_top_n: int = 10
 
-    concept_spacy_enabled: bool = Field(True, description="Enable spaCy")
-    concept_spacy_model: str = Field("ru_core_news_lg", description="spaCy model")
-    concept_spacy_entity_types: list[str] = Field(
-        ["PERSON", "ORG", "GPE", "NORP", "FAC", "LOC"], description="Entity types"
-    )
+    concept_spacy_enabled: bool = True
+    concept_spacy_model: str = "ru_core_news_lg"
+    concept_spacy_entity_types: tuple[str, ...] = _DEFAULT_SPACY_ENTITY_TYPES
 
-    concept_fuzzy_threshold: float = Field(0.85, description="Fuzzy matching threshold")
+    concept_fuzzy_threshold: float = 0.85
 
 
 class GenerationSettings(BaseNestedSettings):
     """Final generation configuration."""
 
-    generation_min_length: int = Field(5000, description="Min material length")
-    generation_timeout_s: float = Field(60.0, description="Generation timeout")
-    generation_retry_count: int = Field(2, description="Retry count")
+    generation_min_length: int = 5000
+    generation_timeout_s: float = 60.0
+    generation_retry_count: int = 2
 
     # Context Reduction
-    generation_retry_max_docs: int = Field(5, description="Max docs on first retry")
-    generation_retry_2_max_docs: int = Field(3, description="Max docs on second retry")
-    generation_retry_2_timeout_s: float = Field(90.0, description="Second retry timeout")
+    generation_retry_max_docs: int = 5
+    generation_retry_2_max_docs: int = 3
+    generation_retry_2_timeout_s: float = 90.0
 
     # Template Fallback
-    generation_template_enabled: bool = Field(True, description="Enable template fallback")
-    generation_template_path: str = Field(
-        "./templates/material_template.md", description="Template path"
-    )
+    generation_template_enabled: bool = True
+    generation_template_path: str = "./templates/material_template.md"
 
 
 class LoggingSettings(BaseNestedSettings):
     """Logging configuration."""
 
-    log_level: str = Field("INFO", description="Log level")
-    log_file: str = Field("./logs/materials_agent.log", description="Log file")
-    log_max_bytes: int = Field(10485760, description="Max log file size")
-    log_backup_count: int = Field(5, description="Backup count")
-    log_format: str = Field(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s", description="Log format"
-    )
+    log_level: str = "INFO"
+    log_file: str = "./logs/materials_agent.log"
+    log_max_bytes: int = 10485760
+    log_backup_count: int = 5
+    log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-    log_json_enabled: bool = Field(True, description="Enable JSON logging")
+    log_json_enabled: bool = True
 
     # Metrics
-    metrics_enabled: bool = Field(True, description="Enable metrics")
-    metrics_track_tot_paths: bool = Field(True, description="Track ToT paths")
-    metrics_track_tool_usage: bool = Field(True, description="Track tool usage")
-    metrics_track_llm_calls: bool = Field(True, description="Track LLM calls")
-    metrics_track_content_guard: bool = Field(True, description="Track content guard")
-    metrics_export_interval_s: int = Field(60, description="Export interval")
+    metrics_enabled: bool = True
+    metrics_track_tot_paths: bool = True
+    metrics_track_tool_usage: bool = True
+    metrics_track_llm_calls: bool = True
+    metrics_track_content_guard: bool = True
+    metrics_export_interval_s: int = 60
 
     # Alerts
-    alert_enabled: bool = Field(True, description="Enable alerts")
-    alert_on_repeated_failures: bool = Field(True, description="Alert on failures")
-    alert_failure_threshold: int = Field(3, description="Failure threshold")
-    alert_email: str | None = Field(None, description="Alert email")
+    alert_enabled: bool = True
+    alert_on_repeated_failures: bool = True
+    alert_failure_threshold: int = 3
+    alert_email: str | None = None
 
 
 class RateLimitSettings(BaseNestedSettings):
     """Rate limiting configuration."""
 
-    rate_limit_gigachat_max_calls_per_minute: int = Field(
-        10, description="GigaChat-2-Max calls/min"
-    )
-    rate_limit_gigachat_max_tokens_per_hour: int = Field(
-        500000, description="GigaChat-2-Max tokens/hour"
-    )
-    rate_limit_gigachat3_max_calls_per_minute: int = Field(1000, description="GigaChat3 calls/min")
+    rate_limit_gigachat_max_calls_per_minute: int = 10
+    rate_limit_gigachat_max_tokens_per_hour: int = 500000
+    rate_limit_gigachat3_max_calls_per_minute: int = 1000
 
     # Cost Estimation
     # Converted from 560 RUB/million tokens
     # Exchange rate: 1 USD = 79.05 RUB (as of December 16, 2025)
     # Calculation: (560 RUB / 1,000,000 tokens) * 1000 / 79.05 ≈ 0.00708 USD/1K tokens
     # TODO: calculate cost in rubles instead of USD
-    cost_per_1k_tokens_gigachat: float = Field(0.00708, description="Cost per 1K tokens")
+    cost_per_1k_tokens_gigachat: float = 0.00708
 
-    cost_alert_threshold_per_request: float = Field(0.10, description="Cost alert per request")
-    cost_alert_threshold_per_hour: float = Field(5.0, description="Cost alert per hour")
+    cost_alert_threshold_per_request: float = 0.10
+    cost_alert_threshold_per_hour: float = 5.0
 
 
 class APISettings(BaseNestedSettings):
     """API configuration."""
 
-    api_host: str = Field("0.0.0.0", description="API host")
-    api_port: int = Field(8000, description="API port")
-    api_workers: int = Field(4, description="Worker count")
+    api_host: str = "0.0.0.0"
+    api_port: int = 8000
+    api_workers: int = 4
 
     # CORS
-    cors_enabled: bool = Field(True, description="Enable CORS")
-    cors_origins: list[str] = Field(
-        ["http://localhost:3000", "https://example.com"], description="CORS origins"
-    )
-    cors_methods: list[str] = Field(["GET", "POST", "PUT", "DELETE"], description="CORS methods")
-    cors_headers: str = Field("*", description="CORS headers")
+    cors_enabled: bool = True
+    cors_origins: tuple[str, ...] = _DEFAULT_CORS_ORIGINS
+    cors_methods: tuple[str, ...] = _DEFAULT_CORS_METHODS
+    cors_headers: str = "*"
 
     # Rate Limiting
-    api_rate_limit_per_minute: int = Field(10, description="Requests per minute")
-    api_rate_limit_per_hour: int = Field(100, description="Requests per hour")
+    api_rate_limit_per_minute: int = 10
+    api_rate_limit_per_hour: int = 100
 
-    include_debug_info: bool = Field(default=True, description="Include debug info")
+    include_debug_info: bool = True
 
 
 class SecuritySettings(BaseNestedSettings):
     """Security configuration."""
 
     secret_key: str = Field(..., description="Secret key for JWT")
-    jwt_algorithm: str = Field("HS256", description="JWT algorithm")
-    jwt_expiration_minutes: int = Field(60, description="JWT expiration")
+    jwt_algorithm: str = "HS256"
+    jwt_expiration_minutes: int = 60
 
 
 class FeatureFlags(BaseNestedSettings):
     """Feature flags."""
 
-    feature_tot_enabled: bool = Field(True, description="Enable ToT")
-    feature_adaptive_rag_enabled: bool = Field(True, description="Enable Adaptive RAG")
-    feature_corrective_rag_enabled: bool = Field(True, description="Enable Corrective RAG")
-    feature_web_search_enabled: bool = Field(True, description="Enable web search")
-    feature_content_guard_enabled: bool = Field(True, description="Enable content guard")
-    feature_procedural_memory_enabled: bool = Field(True, description="Enable procedural memory")
+    feature_tot_enabled: bool = True
+    feature_adaptive_rag_enabled: bool = True
+    feature_corrective_rag_enabled: bool = True
+    feature_web_search_enabled: bool = True
+    feature_content_guard_enabled: bool = True
+    feature_procedural_memory_enabled: bool = True
+    feature_parallel_verification_enabled: bool = True
 
     # Experimental
-    feature_graph_rag_enabled: bool = Field(False, description="Enable Graph RAG")
-    feature_multi_agent_enabled: bool = Field(False, description="Enable multi-agent")
+    feature_graph_rag_enabled: bool = False
+    feature_multi_agent_enabled: bool = False
 
 
 class ProjectSettings(BaseNestedSettings):
     """Project metadata."""
 
-    project_name: str = Field("Materials_Agent_v2", description="Project name")
-    version: str = Field("2.0.0", description="Version")
-    environment: str = Field("production", description="Environment")
-    debug: bool = Field(False, description="Debug mode")
+    project_name: str = "Materials_Agent_v2"
+    version: str = "2.0.0"
+    environment: str = "production"
+    debug: bool = False
+
+
+# Sections that most entry points never touch are built lazily on first access
+# instead of eagerly with the rest of the Settings tree.
+_LAZY_SECTIONS: dict[str, type[BaseNestedSettings]] = {
+    "concept_extraction": ConceptExtractionSettings,
+    "rate_limit": RateLimitSettings,
+    "security": SecuritySettings,
+}
 
 
 class Settings(BaseSettings):
@@ -513,6 +663,7 @@ class Settings(BaseSettings):
     llm: LLMSettings = Field(default_factory=LLMSettings)  # pyright: ignore[reportArgumentType]
     tot: ToTSettings = Field(default_factory=ToTSettings)  # pyright: ignore[reportArgumentType]
     content_guard: ContentGuardSettings = Field(default_factory=ContentGuardSettings)  # pyright: ignore[reportArgumentType]
+    embedding: EmbeddingSettings = Field(default_factory=EmbeddingSettings)  # pyright: ignore[reportArgumentType]
     adaptive_rag: AdaptiveRAGSettings = Field(default_factory=AdaptiveRAGSettings)  # pyright: ignore[reportArgumentType]
     corrective_rag: CorrectiveRAGSettings = Field(default_factory=CorrectiveRAGSettings)  # pyright: ignore[reportArgumentType]
     web_search: WebSearchSettings = Field(default_factory=WebSearchSettings)  # pyright: ignore[reportArgumentType]
@@ -521,14 +672,9 @@ class Settings(BaseSettings):
     cache: CacheSettings = Field(default_factory=CacheSettings)  # pyright: ignore[reportArgumentType]
     database: DataBaseModel = Field(default_factory=DataBaseModel)  # pyright: ignore[reportArgumentType]
     validation: ValidationSettings = Field(default_factory=ValidationSettings)  # pyright: ignore[reportArgumentType]
-    concept_extraction: ConceptExtractionSettings = Field(
-        default_factory=ConceptExtractionSettings  # pyright: ignore[reportArgumentType]
-    )
     generation: GenerationSettings = Field(default_factory=GenerationSettings)  # pyright: ignore[reportArgumentType]
     logging: LoggingSettings = Field(default_factory=LoggingSettings)  # pyright: ignore[reportArgumentType]
-    rate_limit: RateLimitSettings = Field(default_factory=RateLimitSettings)  # pyright: ignore[reportArgumentType]
     api: APISettings = Field(default_factory=APISettings)  # pyright: ignore[reportArgumentType]
-    security: SecuritySettings = Field(default_factory=SecuritySettings)  # pyright: ignore[reportArgumentType]
     features: FeatureFlags = Field(default_factory=FeatureFlags)  # pyright: ignore[reportArgumentType]
     vector_store: VectorStoreSettings = Field(default_factory=VectorStoreSettings)  # pyright: ignore[reportArgumentType]
 
@@ -538,10 +684,148 @@ class Settings(BaseSettings):
         case_sensitive=False,
         env_nested_delimiter="__",
         extra="ignore",
+        defer_build=True,
+        revalidate_instances="never",
+        validate_assignment=False,
+        frozen=True,
     )
 
+    def __hash__(self) -> int:
+        # Same identity hash as BaseNestedSettings: one instance per process.
+        return hash(id(self))
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        return (
+            init_settings,
+            env_settings,
+            CachedDotEnvSettingsSource(settings_cls),
+            file_secret_settings,
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        sub_cls = _LAZY_SECTIONS.get(name)
+        if sub_cls is None:
+            return super().__getattr__(name)
+        instance = sub_cls()
+        # Cache directly in __dict__ so normal attribute lookup finds it next time.
+        self.__dict__[name] = instance
+        return instance
+
+
+# When the local .env is trusted (the default for this service), Settings can be
+# assembled with model_construct instead of full recursive validation, which
+# skips per-field validator dispatch across ~150 fields. Set CONFIG_TRUSTED=0
+# to force the full-validation path.
+_TRUSTED_ENV = os.environ.get("CONFIG_TRUSTED", "1") == "1"
+
+
+@lru_cache(maxsize=None)
+def _adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def _coerce(raw: str, annotation: Any) -> Any:
+    """Coerce a raw env string to the field's type (JSON first, like pydantic-settings)."""
+    adapter = _adapter(annotation)
+    try:
+        return adapter.validate_json(raw)
+    except ValidationError:
+        return adapter.validate_python(raw)
+
+
+@lru_cache(maxsize=1)
+def _env_values() -> dict[str, str]:
+    """Parse .env once and merge os.environ over it (lower-cased keys).
+
+    Every BaseSettings subclass would otherwise open and tokenize the same
+    file; all sub-settings are populated from this single pass instead.
+    """
+    env = {k.lower(): v for k, v in dotenv_values(".env").items() if v is not None}
+    for k, v in os.environ.items():
+        env[k.lower()] = v
+    return env
+
+
+# Default kinds for the precompiled field plan below.
+_PLAIN = 0
+_FACTORY = 1
+_REQUIRED = 2
+
+
+@lru_cache(maxsize=1)
+def _settings_plan() -> tuple[tuple[str, Any, tuple[tuple[str, Any, int, Any], ...]], ...]:
+    """Compile the Settings field layout into flat tuples, once per process.
+
+    Walking ``model_fields``/``FieldInfo`` metadata is the expensive,
+    reflection-driven part of building settings. The plan freezes that shape
+    ahead of time so the builder is a straight loop over tuples — the same
+    "specialize to the fixed schema" idea as generating a loader module,
+    without writing generated source to disk.
+    """
+    plan = []
+    for section_name, section_field in Settings.model_fields.items():
+        sub_cls = section_field.annotation
+        fields = []
+        for field_name, field_info in sub_cls.model_fields.items():
+            if field_info.default_factory is not None:
+                fields.append((field_name, field_info.annotation, _FACTORY, field_info.default_factory))
+            elif field_info.default is not PydanticUndefined:
+                fields.append((field_name, field_info.annotation, _PLAIN, field_info.default))
+            else:
+                fields.append((field_name, field_info.annotation, _REQUIRED, None))
+        plan.append((section_name, sub_cls, tuple(fields)))
+    return tuple(plan)
+
+
+def _build_settings_trusted() -> Settings:
+    """Fast-path Settings build via model_construct for a trusted environment."""
+    env = _env_values()
+
+    sections: dict[str, Any] = {}
+    for section_name, sub_cls, fields in _settings_plan():
+        values: dict[str, Any] = {}
+        for field_name, annotation, kind, default in fields:
+            raw = env.get(field_name)
+            if raw is not None:
+                values[field_name] = _coerce(raw, annotation)
+            elif kind == _FACTORY:
+                values[field_name] = default()
+            elif kind == _PLAIN:
+                values[field_name] = default
+            else:
+                # Required fields (e.g. SECRET_KEY, GIGACHAT_API_KEY) still
+                # need to be present even on the trusted path.
+                raise ValueError(f"Missing required setting: {field_name.upper()}")
+        sections[section_name] = sub_cls.model_construct(**values)
+
+    return Settings.model_construct(**sections)
+
+
+# Module-level singleton instead of @lru_cache: get_settings is on most request
+# paths, and the plain None-check avoids lru_cache's _make_key/hash-table work.
+_SETTINGS: Settings | None = None
+_SETTINGS_LOCK = threading.Lock()
+
 
-@lru_cache
 def get_settings() -> Settings:
     """Get cached settings instance."""
-    return Settings()
+    global _SETTINGS  # noqa: PLW0603
+    if _SETTINGS is not None:
+        return _SETTINGS
+
+    with _SETTINGS_LOCK:
+        if _SETTINGS is None:
+            _SETTINGS = _build_settings_trusted() if _TRUSTED_ENV else Settings()
+    return _SETTINGS
+
+
+# Canonical module-level instance; some modules import `settings` directly.
+settings = get_settings()
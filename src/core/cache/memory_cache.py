@@ -3,20 +3,29 @@ In-memory caching (fallback for Redis).
 """
 
 import hashlib
+import heapq
 import json
 import logging
 import time
-from collections import OrderedDict
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Bound once at import: cuts a module + attribute lookup on every cache op.
+_monotonic = time.monotonic
+_DEBUG = logging.DEBUG
+
 
 class MemoryCache:
     """
-    Simple in-memory LRU cache.
+    Simple in-memory SLRU (segmented LRU) cache.
 
     Used as fallback when Redis is unavailable.
+
+    New keys enter the probation segment; a second hit promotes to the
+    protected segment (~80% of capacity). Evictions come from probation, so
+    a one-shot scan larger than the cache cannot flush the hot working set —
+    plain LRU's classic failure mode on long-tail RAG query streams.
     """
 
     def __init__(self, max_size: int = 1000, default_ttl: int = 3600) -> None:
@@ -29,84 +38,191 @@ class MemoryCache:
         """
         self.max_size = max_size
         self.default_ttl = default_ttl
-        self.cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.protected_size = max(1, (max_size * 4) // 5)
+        # Entries are (value, expires_at) tuples: ~64 bytes vs ~232 for a
+        # per-entry dict, and index access instead of two string-keyed lookups.
+        # Plain dicts: insertion order is guaranteed since 3.7 and the
+        # container is ~2x smaller than OrderedDict; LRU reorder is a
+        # pop + reinsert (both O(1), appends at the end).
+        # Probation entries are (value, expires_at): inserts only, so dict
+        # order already equals recency order. Protected entries carry a third
+        # element — the access generation — so a hit is a single dict write
+        # instead of a pop + reinsert; recency ordering is reconstructed only
+        # on the rare demotion path.
+        self.probation: dict[str, tuple[Any, float]] = {}
+        self.protected: dict[str, tuple[Any, float, int]] = {}
+        self._gen = 0
+        # Min-heap of (expires_at, key) so cleanup pops only entries that are
+        # actually expired instead of scanning the whole cache.
+        self._expiry_heap: list[tuple[float, str]] = []
+        # Plain int counters (atomic under the GIL) — the hit ratio tells
+        # operators whether the size/eviction policy fits the workload.
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
         logger.info(f"💾 Memory cache initialized (max_size={max_size})")
 
     def _generate_key(self, prefix: str, *args, **kwargs) -> str:
         """Generate cache key."""
+        # Fast path: when every argument is hashable (the common
+        # single-string-arg case), the builtin tuple hash beats a full
+        # json.dumps + digest round-trip by an order of magnitude.
+        try:
+            return f"{prefix}:{hash((args, tuple(sorted(kwargs.items()))))}"
+        except TypeError:
+            pass  # unhashable arg (dict/list) — fall back to serialization
+
+        # ensure_ascii=False keeps Cyrillic args as 2 utf-8 bytes instead of
+        # 6-char \uXXXX escapes; compact separators trim the rest. Less data
+        # in = fewer hash compression rounds.
         key_data = json.dumps(
-            {"args": args, "kwargs": sorted(kwargs.items())}, sort_keys=True, default=str
+            {"args": args, "kwargs": sorted(kwargs.items())},
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+            separators=(",", ":"),
         )
 
-        key_hash = hashlib.md5(key_data.encode()).hexdigest()[:16]
+        # blake2b is faster than md5 for short inputs and collision-resistant;
+        # digest_size=8 yields 16 hex chars directly, no slicing needed.
+        key_hash = hashlib.blake2b(key_data.encode("utf-8"), digest_size=8).hexdigest()
         return f"{prefix}:{key_hash}"
 
     def get(self, key: str) -> Any | None:
         """Get value from cache."""
-        if key not in self.cache:
-            logger.debug(f"❌ Cache miss: {key}")
+        # Single dict.get instead of `in` + `[]` (one hash probe, not two)
+        entry = self.protected.get(key)
+        if entry is not None:
+            value, expires_at, _ = entry
+            if _monotonic() > expires_at:
+                self.misses += 1
+                if logger.isEnabledFor(_DEBUG):
+                    logger.debug(f"⏰ Cache expired: {key}")
+                del self.protected[key]
+                return None
+            # Recency bump: one dict write, no linked-list relink per hit
+            self.protected[key] = (value, expires_at, self._gen)
+            self._gen += 1
+            self.hits += 1
+            if logger.isEnabledFor(_DEBUG):
+                logger.debug(f"✅ Cache hit: {key}")
+            return value
+
+        entry = self.probation.get(key)
+        if entry is None:
+            self.misses += 1
+            if logger.isEnabledFor(_DEBUG):
+                logger.debug(f"❌ Cache miss: {key}")
             return None
 
-        # Check expiration
-        entry = self.cache[key]
-        if time.time() > entry["expires_at"]:
-            logger.debug(f"⏰ Cache expired: {key}")
-            del self.cache[key]
+        value, expires_at = entry
+        if _monotonic() > expires_at:
+            self.misses += 1
+            if logger.isEnabledFor(_DEBUG):
+                logger.debug(f"⏰ Cache expired: {key}")
+            del self.probation[key]
             return None
 
-        # Move to end (LRU)
-        self.cache.move_to_end(key)
-
-        logger.debug(f"✅ Cache hit: {key}")
-        return entry["value"]
+        # Second hit: promote to protected; the least-recently-accessed
+        # protected entry (min generation) is demoted back to probation to
+        # keep segment sizes bounded. The O(n) min-scan runs only on this
+        # rare demotion path, not per hit.
+        del self.probation[key]
+        self.protected[key] = (value, expires_at, self._gen)
+        self._gen += 1
+        if len(self.protected) > self.protected_size:
+            demoted_key = min(self.protected, key=lambda k: self.protected[k][2])
+            demoted_value, demoted_exp, _ = self.protected.pop(demoted_key)
+            self.probation[demoted_key] = (demoted_value, demoted_exp)
+
+        self.hits += 1
+        if logger.isEnabledFor(_DEBUG):
+            logger.debug(f"✅ Cache hit: {key}")
+        return value
 
     def set(self, key: str, value: Any, ttl: int | None = None) -> None:
         """Set value in cache."""
         ttl = ttl or self.default_ttl
 
-        # Evict oldest if at capacity
-        if len(self.cache) >= self.max_size and key not in self.cache:
-            oldest_key = next(iter(self.cache))
-            del self.cache[oldest_key]
-            logger.debug(f"🗑️ Evicted oldest: {oldest_key}")
-
-        # Store
-        self.cache[key] = {"value": value, "expires_at": time.time() + ttl}
-
-        # Move to end
-        self.cache.move_to_end(key)
-
-        logger.debug(f"✅ Cache set: {key} (TTL: {ttl}s)")
+        # Store (monotonic deadlines: immune to wall-clock jumps, and reads
+        # hit the vDSO instead of a syscall on Linux)
+        expires_at = _monotonic() + ttl
+        entry = (value, expires_at)
+
+        if key in self.protected:
+            self.protected[key] = (value, expires_at, self._gen)
+            self._gen += 1
+        elif key in self.probation:
+            self.probation.pop(key)
+            self.probation[key] = entry
+        else:
+            # Evict from probation first; protected only drains if probation
+            # is empty (all residents earned a second hit).
+            if len(self.probation) + len(self.protected) >= self.max_size:
+                victims = self.probation or self.protected
+                oldest_key = next(iter(victims))
+                del victims[oldest_key]
+                self.evictions += 1
+                if logger.isEnabledFor(_DEBUG):
+                    logger.debug(f"🗑️ Evicted oldest: {oldest_key}")
+            self.probation[key] = entry
+
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+
+        if logger.isEnabledFor(_DEBUG):
+            logger.debug(f"✅ Cache set: {key} (TTL: {ttl}s)")
 
     def delete(self, key: str) -> None:
         """Delete key from cache."""
-        if key in self.cache:
-            del self.cache[key]
-            logger.debug(f"🗑️ Cache deleted: {key}")
+        if self.probation.pop(key, None) is not None or self.protected.pop(key, None) is not None:
+            if logger.isEnabledFor(_DEBUG):
+                logger.debug(f"🗑️ Cache deleted: {key}")
 
     def clear(self) -> None:
         """Clear all cache."""
-        count = len(self.cache)
-        self.cache.clear()
+        count = len(self.probation) + len(self.protected)
+        self.probation.clear()
+        self.protected.clear()
+        self._expiry_heap.clear()
         logger.info(f"🗑️ Cleared {count} cache entries")
 
     def cleanup_expired(self) -> None:
-        """Remove expired entries."""
-        now = time.time()
-        expired_keys = [key for key, entry in self.cache.items() if now > entry["expires_at"]]
+        """Remove expired entries.
 
-        for key in expired_keys:
-            del self.cache[key]
-
-        if expired_keys:
-            logger.info(f"🗑️ Cleaned up {len(expired_keys)} expired entries")
+        O(k log n) in the number of actually expired entries: pops the
+        expiry heap instead of scanning every cache entry.
+        """
+        now = _monotonic()
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expires_at, key = heapq.heappop(heap)
+            # Stale heap records (key overwritten with a new deadline or
+            # already evicted) are skipped.
+            for segment in (self.probation, self.protected):
+                entry = segment.get(key)
+                if entry is not None and entry[1] == expires_at:
+                    del segment[key]
+                    removed += 1
+                    break
+
+        if removed:
+            logger.info(f"🗑️ Cleaned up {removed} expired entries")
 
     def stats(self) -> dict[str, Any]:
         """Get cache statistics."""
+        size = len(self.probation) + len(self.protected)
+        lookups = self.hits + self.misses
         return {
-            "size": len(self.cache),
+            "size": size,
+            "probation_size": len(self.probation),
+            "protected_size": len(self.protected),
             "max_size": self.max_size,
-            "utilization": len(self.cache) / self.max_size,
+            "utilization": size / self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
         }
 
 
@@ -2,19 +2,24 @@
 Redis caching layer.
 """
 
+import asyncio
 import hashlib
+import inspect
 import json
 import logging
 from collections.abc import Callable
 from functools import wraps
 from typing import Any
 
+import orjson
 import redis.asyncio as aioredis
 
 from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+_DEBUG = logging.DEBUG
+
 
 class RedisCache:
     """
@@ -24,9 +29,10 @@ class RedisCache:
     def __init__(self) -> None:
         """Initialize Redis cache."""
         self.settings = get_settings()
-        self.enabled = self.settings.cache.cache_enabled
+        self.enabled = self.settings.cache.redis_enabled
         self.redis: aioredis.Redis | None = None
         self.ttl = self.settings.cache.cache_ttl_seconds
+        self.op_timeout = self.settings.cache.cache_op_timeout_ms / 1000
 
         if self.enabled:
             self._connect()
@@ -34,8 +40,13 @@ class RedisCache:
     def _connect(self) -> None:
         """Connect to Redis."""
         try:
+            # decode_responses stays off: orjson consumes and produces bytes,
+            # so values go to/from Redis without a utf-8 decode round-trip.
             self.redis = aioredis.from_url(
-                self.settings.cache.redis_url, encoding="utf-8", decode_responses=True
+                self.settings.cache.redis_url,
+                socket_connect_timeout=1,
+                socket_keepalive=True,
+                health_check_interval=30,
             )
             logger.info(f"✅ Redis cache connected: {self.settings.cache.redis_url}")
         except Exception as e:
@@ -54,13 +65,24 @@ class RedisCache:
         Returns:
             Cache key string
         """
-        # Create deterministic string from args
+        # NB: no builtin-hash fast path here (unlike MemoryCache): hash() of
+        # strings is randomized per process (PYTHONHASHSEED), and Redis keys
+        # must be stable across workers and restarts.
+
+        # Create deterministic string from args. ensure_ascii=False keeps
+        # Cyrillic queries as utf-8 bytes instead of \uXXXX escapes and the
+        # compact separators shave a couple bytes per entry before hashing.
         key_data = json.dumps(
-            {"args": args, "kwargs": sorted(kwargs.items())}, sort_keys=True, default=str
+            {"args": args, "kwargs": sorted(kwargs.items())},
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+            separators=(",", ":"),
         )
 
-        # Hash it
-        key_hash = hashlib.md5(key_data.encode()).hexdigest()[:16]
+        # Hash it (blake2b with digest_size=8 gives 16 hex chars directly and
+        # is faster than md5 for short inputs)
+        key_hash = hashlib.blake2b(key_data.encode("utf-8"), digest_size=8).hexdigest()
 
         return f"{prefix}:{key_hash}"
 
@@ -78,11 +100,17 @@ class RedisCache:
             return None
 
         try:
-            value = await self.redis.get(key)
+            value = await asyncio.wait_for(self.redis.get(key), self.op_timeout)
             if value:
-                logger.debug(f"✅ Cache hit: {key}")
-                return json.loads(value)
-            logger.debug(f"❌ Cache miss: {key}")
+                if logger.isEnabledFor(_DEBUG):
+                    logger.debug(f"✅ Cache hit: {key}")
+                return orjson.loads(value)
+            if logger.isEnabledFor(_DEBUG):
+                logger.debug(f"❌ Cache miss: {key}")
+            return None
+        except TimeoutError:
+            # Degraded Redis: cap tail latency at the op budget, treat as miss
+            logger.warning(f"⚠️ Cache get timed out after {self.op_timeout}s: {key}")
             return None
         except Exception as e:
             logger.warning(f"⚠️ Cache get failed: {e}")
@@ -102,9 +130,12 @@ class RedisCache:
 
         try:
             ttl = ttl or self.ttl
-            value_json = json.dumps(value, default=str)
-            await self.redis.setex(key, ttl, value_json)
-            logger.debug(f"✅ Cache set: {key} (TTL: {ttl}s)")
+            value_json = orjson.dumps(value, default=str)
+            await asyncio.wait_for(self.redis.setex(key, ttl, value_json), self.op_timeout)
+            if logger.isEnabledFor(_DEBUG):
+                logger.debug(f"✅ Cache set: {key} (TTL: {ttl}s)")
+        except TimeoutError:
+            logger.warning(f"⚠️ Cache set timed out after {self.op_timeout}s: {key}")
         except Exception as e:
             logger.warning(f"⚠️ Cache set failed: {e}")
 
@@ -115,7 +146,8 @@ class RedisCache:
 
         try:
             await self.redis.delete(key)
-            logger.debug(f"🗑️ Cache deleted: {key}")
+            if logger.isEnabledFor(_DEBUG):
+                logger.debug(f"🗑️ Cache deleted: {key}")
         except Exception as e:
             logger.warning(f"⚠️ Cache delete failed: {e}")
 
@@ -130,10 +162,21 @@ class RedisCache:
             return
 
         try:
-            keys = await self.redis.keys(pattern)
-            if keys:
-                await self.redis.delete(*keys)
-                logger.info(f"🗑️ Cleared {len(keys)} keys matching: {pattern}")
+            # SCAN is cursor-based (never blocks the server, unlike KEYS) and
+            # UNLINK frees memory in a background thread; deletes are batched
+            # through a non-transactional pipeline.
+            cleared = 0
+            pipe = self.redis.pipeline(transaction=False)
+            async for key in self.redis.scan_iter(match=pattern, count=500):
+                pipe.unlink(key)
+                cleared += 1
+                if cleared % 500 == 0:
+                    await pipe.execute()
+                    pipe = self.redis.pipeline(transaction=False)
+            if cleared % 500:
+                await pipe.execute()
+            if cleared:
+                logger.info(f"🗑️ Cleared {cleared} keys matching: {pattern}")
         except Exception as e:
             logger.warning(f"⚠️ Cache clear failed: {e}")
 
@@ -144,6 +187,24 @@ class RedisCache:
             logger.info("🔌 Redis connection closed")
 
 
+# Singleflight map: concurrent misses on the same key await one in-flight call
+# instead of each invoking the expensive function (thundering-herd collapse).
+_inflight: dict[str, asyncio.Task] = {}
+
+# One RedisCache (and thus one aioredis client + connection pool) per process.
+# Constructing a client per decorated call leaked connection objects and paid
+# settings + connect cost on every invocation.
+_shared_cache: RedisCache | None = None
+
+
+def get_redis_cache() -> RedisCache:
+    """Get the shared RedisCache instance, creating it on first use."""
+    global _shared_cache  # noqa: PLW0603
+    if _shared_cache is None:
+        _shared_cache = RedisCache()
+    return _shared_cache
+
+
 def cached(prefix: str, ttl: int | None = None):
     """
     Decorator for caching function results.
@@ -155,24 +216,49 @@ def cached(prefix: str, ttl: int | None = None):
     """
 
     def decorator(func: Callable):
+        # Canonical kwargs order comes from the signature, captured once at
+        # decoration time — no per-call Timsort over kwargs.items().
+        param_order = tuple(inspect.signature(func).parameters)
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            cache = RedisCache()
+            cache = get_redis_cache()
 
             if not cache.enabled:
                 # Cache disabled, execute directly
                 return await func(*args, **kwargs)
 
             # Generate cache key
-            key = cache._generate_key(prefix, *args, **kwargs)
+            if kwargs:
+                kwargs_items = [(p, kwargs[p]) for p in param_order if p in kwargs]
+            else:
+                kwargs_items = []
+            key_data = json.dumps(
+                {"args": args, "kwargs": kwargs_items},
+                default=str,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            key_hash = hashlib.blake2b(key_data.encode("utf-8"), digest_size=8).hexdigest()
+            key = f"{prefix}:{key_hash}"
 
             # Try to get from cache
             cached_value = await cache.get(key)
             if cached_value is not None:
                 return cached_value
 
-            # Execute function
-            result = await func(*args, **kwargs)
+            # Coalesce concurrent misses: only the first caller runs func,
+            # the rest await the same task.
+            task = _inflight.get(key)
+            if task is not None:
+                return await task
+
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            _inflight[key] = task
+            try:
+                result = await task
+            finally:
+                _inflight.pop(key, None)
 
             # Cache result
             await cache.set(key, result, ttl=ttl)
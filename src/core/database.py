@@ -4,7 +4,19 @@ from collections.abc import Generator
 from contextlib import contextmanager
 from datetime import datetime
 
-from sqlalchemy import Boolean, Float, Integer, String, Text, create_engine
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    create_engine,
+    event,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
 
 
@@ -12,13 +24,19 @@ class Base(DeclarativeBase):
     """Базовый класс для всех моделей."""
 
 
+# JSON payloads are stored natively instead of as Text: the driver hands back
+# dicts/lists directly (no json.loads per read) and on PostgreSQL the JSONB
+# variant is binary and queryable by inner fields.
+_JSONVariant = JSON().with_variant(JSONB, "postgresql")
+
+
 class User(Base):
     """Таблица пользователей."""
 
     __tablename__ = "users"
 
     user_id: Mapped[str] = mapped_column(String, primary_key=True)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
 
 class AssessmentSession(Base):
@@ -28,8 +46,8 @@ class AssessmentSession(Base):
 
     session_id: Mapped[str] = mapped_column(String, primary_key=True)
     user_id: Mapped[str] = mapped_column(String, nullable=False)
-    questions: Mapped[str] = mapped_column(Text, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    questions: Mapped[list] = mapped_column(_JSONVariant, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
 
 class Assessment(Base):
@@ -42,9 +60,9 @@ class Assessment(Base):
     session_id: Mapped[str] = mapped_column(String, nullable=False)
     level: Mapped[str] = mapped_column(String, nullable=False)
     score: Mapped[float] = mapped_column(Float, nullable=False)
-    knowledge_areas: Mapped[str] = mapped_column(Text, nullable=False)
-    recommendations: Mapped[str] = mapped_column(Text, nullable=False)
-    completed_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    knowledge_areas: Mapped[dict] = mapped_column(_JSONVariant, nullable=False)
+    recommendations: Mapped[list] = mapped_column(_JSONVariant, nullable=False)
+    completed_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
 
 class Test(Base):
@@ -55,9 +73,20 @@ class Test(Base):
     test_id: Mapped[str] = mapped_column(String, primary_key=True)
     topic: Mapped[str] = mapped_column(String, nullable=False)
     difficulty: Mapped[str] = mapped_column(String, nullable=False)
-    questions: Mapped[str] = mapped_column(Text, nullable=False)
+    questions: Mapped[list] = mapped_column(_JSONVariant, nullable=False)
     expected_duration: Mapped[int] = mapped_column(Integer, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+    # GIN over jsonb_path_ops enables containment queries on questions
+    # server-side (PostgreSQL only; other dialects get a plain index).
+    __table_args__ = (
+        Index(
+            "ix_test_questions_gin",
+            "questions",
+            postgresql_using="gin",
+            postgresql_ops={"questions": "jsonb_path_ops"},
+        ),
+    )
 
 
 class TestResult(Base):
@@ -68,8 +97,8 @@ class TestResult(Base):
     result_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     test_id: Mapped[str] = mapped_column(String, nullable=False)
     user_id: Mapped[str] = mapped_column(String, nullable=False)
-    answers: Mapped[str] = mapped_column(Text, nullable=False)
-    submitted_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    answers: Mapped[list] = mapped_column(_JSONVariant, nullable=False)
+    submitted_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
 
 class Verification(Base):
@@ -93,7 +122,7 @@ class Verification(Base):
     agree_with_primary: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
     verification_notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
 
 class CustomTopic(Base):
@@ -105,7 +134,7 @@ class CustomTopic(Base):
     user_id: Mapped[str] = mapped_column(String, nullable=False)
     topic_name: Mapped[str] = mapped_column(String, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
 
 class SupportSession(Base):
@@ -118,10 +147,10 @@ class SupportSession(Base):
     user_message: Mapped[str] = mapped_column(Text, nullable=False)
     emotional_state: Mapped[str] = mapped_column(String, nullable=False)
     response_content: Mapped[str] = mapped_column(Text, nullable=False)
-    recommendations: Mapped[str] = mapped_column(Text, nullable=False)
+    recommendations: Mapped[list] = mapped_column(_JSONVariant, nullable=False)
     helpful: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
     comments: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
 
 """
@@ -132,7 +161,17 @@ Updated with Section 10.1 tables.
 import logging
 from datetime import datetime
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Float, Index, Integer, String, Text
+import orjson
+from sqlalchemy import (
+    JSON,
+    Index,
+    String,
+    Text,
+    bindparam,
+    insert,
+    text,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from src.config import get_settings
@@ -150,44 +189,57 @@ class MaterialGeneration(Base):
 
     __tablename__ = "material_generations"
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    generation_id = Column(String(50), unique=True, nullable=False, index=True)
-    user_id = Column(String(100), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    generation_id: Mapped[str] = mapped_column(String(50), unique=True, index=True)
+    user_id: Mapped[str] = mapped_column(String(100), index=True)
 
     # Request data
-    topic = Column(Text, nullable=False, index=True)
-    user_level = Column(String(20), nullable=False)
+    topic: Mapped[str] = mapped_column(Text, index=True)
+    user_level: Mapped[str] = mapped_column(String(20))
 
     # ToT metrics
-    tot_iterations = Column(Integer, nullable=False)
-    tot_explored_nodes = Column(Integer, nullable=False)
-    tot_dead_end_nodes = Column(Integer, nullable=False)
-    tot_best_path_depth = Column(Integer, nullable=False)
+    tot_iterations: Mapped[int] = mapped_column()
+    tot_explored_nodes: Mapped[int] = mapped_column()
+    tot_dead_end_nodes: Mapped[int] = mapped_column()
+    tot_best_path_depth: Mapped[int] = mapped_column()
 
     # Tool usage
-    tools_used = Column(JSON, nullable=False)  # ["adaptive_rag", "web_search"]
-    tool_call_counts = Column(JSON, nullable=False)  # {"adaptive_rag": 1, ...}
+    tools_used: Mapped[list] = mapped_column(JSON)  # ["adaptive_rag", "web_search"]
+    tool_call_counts: Mapped[dict] = mapped_column(JSON)  # {"adaptive_rag": 1, ...}
 
     # LLM usage
-    gigachat2_max_calls = Column(Integer, nullable=False)
-    gigachat3_calls = Column(Integer, nullable=False)
-    estimated_cost_usd = Column(Float, nullable=False)
+    gigachat2_max_calls: Mapped[int] = mapped_column()
+    gigachat3_calls: Mapped[int] = mapped_column()
+    estimated_cost_usd: Mapped[float] = mapped_column()
 
     # Results
-    success = Column(Boolean, nullable=False, index=True)
-    final_completeness_score = Column(Float, nullable=False)
-    documents_collected = Column(Integer, nullable=False)
-    material_length = Column(Integer, nullable=False)
-    material_content = Column(Text, nullable=True)
+    success: Mapped[bool] = mapped_column(index=True)
+    final_completeness_score: Mapped[float] = mapped_column()
+    documents_collected: Mapped[int] = mapped_column()
+    material_length: Mapped[int] = mapped_column()
+    material_content: Mapped[str | None] = mapped_column(Text)
 
     # Performance
-    generation_time_seconds = Column(Float, nullable=False)
-    created_at = Column(DateTime, default=datetime.now, index=True)
+    generation_time_seconds: Mapped[float] = mapped_column()
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), index=True)
 
     # Metadata
-    memory_hints_used = Column(Boolean, default=False)
-    content_guard_filtered = Column(Integer, default=0)
-    fallbacks_triggered = Column(JSON, nullable=True)
+    memory_hints_used: Mapped[bool] = mapped_column(default=False)
+    content_guard_filtered: Mapped[int] = mapped_column(default=0)
+    fallbacks_triggered: Mapped[list | None] = mapped_column(JSON)
+
+    # Analytics queries filter by (user_id, created_at) and by successful
+    # runs over time; composite/partial indexes avoid bitmap merges over
+    # the single-column indexes above.
+    __table_args__ = (
+        Index("ix_mg_user_created", "user_id", "created_at"),
+        Index(
+            "ix_mg_success_created",
+            "created_at",
+            postgresql_where=text("success IS TRUE"),
+            sqlite_where=text("success IS TRUE"),
+        ),
+    )
 
 
 # ════════════════════════════════════════════════════════════════
@@ -200,33 +252,36 @@ class ToTNodeLog(Base):
 
     __tablename__ = "tot_node_logs"
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    generation_id = Column(String(50), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    generation_id: Mapped[str] = mapped_column(String(50), index=True)
 
     # Node identification
-    node_id = Column(String(50), nullable=False)
-    parent_node_id = Column(String(50), nullable=True)
-    depth = Column(Integer, nullable=False)
+    node_id: Mapped[str] = mapped_column(String(50))
+    parent_node_id: Mapped[str | None] = mapped_column(String(50))
+    depth: Mapped[int] = mapped_column()
 
     # Node data
-    thought = Column(Text, nullable=False)
-    reasoning = Column(Text, nullable=False)
-    planned_action = Column(JSON, nullable=False)
+    thought: Mapped[str] = mapped_column(Text)
+    reasoning: Mapped[str] = mapped_column(Text)
+    planned_action: Mapped[dict] = mapped_column(JSON)
 
     # Scores
-    promise_score = Column(Float, nullable=False)
-    completeness_score = Column(Float, nullable=False)
-    relevance_score = Column(Float, nullable=False)
-    quality_score = Column(Float, nullable=False)
+    promise_score: Mapped[float] = mapped_column()
+    completeness_score: Mapped[float] = mapped_column()
+    relevance_score: Mapped[float] = mapped_column()
+    quality_score: Mapped[float] = mapped_column()
 
     # Status
-    status = Column(String(20), nullable=False, index=True)
+    status: Mapped[str] = mapped_column(String(20), index=True)
 
     # Performance
-    execution_time_ms = Column(Float, nullable=False)
-    llm_calls = Column(JSON, nullable=False)
+    execution_time_ms: Mapped[float] = mapped_column()
+    llm_calls: Mapped[dict] = mapped_column(JSON)
+
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
-    created_at = Column(DateTime, default=datetime.now)
+    # Node drill-downs filter a generation by status (e.g. dead ends only).
+    __table_args__ = (Index("ix_tot_gen_status", "generation_id", "status"),)
 
 
 # ════════════════════════════════════════════════════════════════
@@ -239,30 +294,30 @@ class ToolUsageStats(Base):
 
     __tablename__ = "tool_usage_stats"
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
-    tool_name = Column(String(50), nullable=False)
-    date = Column(String(10), nullable=False)  # YYYY-MM-DD
+    tool_name: Mapped[str] = mapped_column(String(50))
+    date: Mapped[str] = mapped_column(String(10))  # YYYY-MM-DD
 
     # Counts
-    total_calls = Column(Integer, default=0)
-    successful_calls = Column(Integer, default=0)
-    failed_calls = Column(Integer, default=0)
+    total_calls: Mapped[int] = mapped_column(default=0)
+    successful_calls: Mapped[int] = mapped_column(default=0)
+    failed_calls: Mapped[int] = mapped_column(default=0)
 
     # Performance
-    avg_execution_time_ms = Column(Float, default=0.0)
-    min_execution_time_ms = Column(Float, default=0.0)
-    max_execution_time_ms = Column(Float, default=0.0)
+    avg_execution_time_ms: Mapped[float] = mapped_column(default=0.0)
+    min_execution_time_ms: Mapped[float] = mapped_column(default=0.0)
+    max_execution_time_ms: Mapped[float] = mapped_column(default=0.0)
 
     # Strategy distribution (for Adaptive RAG)
-    strategy_tfidf_count = Column(Integer, default=0)
-    strategy_semantic_count = Column(Integer, default=0)
-    strategy_hybrid_count = Column(Integer, default=0)
+    strategy_tfidf_count: Mapped[int] = mapped_column(default=0)
+    strategy_semantic_count: Mapped[int] = mapped_column(default=0)
+    strategy_hybrid_count: Mapped[int] = mapped_column(default=0)
 
     # Fallbacks
-    fallback_triggered_count = Column(Integer, default=0)
+    fallback_triggered_count: Mapped[int] = mapped_column(default=0)
 
-    updated_at = Column(DateTime, default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
     __table_args__ = (Index("idx_tool_date", "tool_name", "date", unique=True),)
 
@@ -277,21 +332,21 @@ class ProceduralPatternDB(Base):
 
     __tablename__ = "procedural_patterns"
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    pattern_id = Column(String(50), unique=True, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    pattern_id: Mapped[str] = mapped_column(String(50), unique=True)
 
-    topic_category = Column(String(50), nullable=False, index=True)
-    user_level = Column(String(20), nullable=False, index=True)
+    topic_category: Mapped[str] = mapped_column(String(50), index=True)
+    user_level: Mapped[str] = mapped_column(String(20), index=True)
 
-    tools_sequence = Column(JSON, nullable=False)
-    avg_iterations = Column(Float, nullable=False)
-    success_score = Column(Float, nullable=False, index=True)
-    usage_count = Column(Integer, default=1)
+    tools_sequence: Mapped[list] = mapped_column(JSON)
+    avg_iterations: Mapped[float] = mapped_column()
+    success_score: Mapped[float] = mapped_column(index=True)
+    usage_count: Mapped[int] = mapped_column(default=1)
 
-    reasoning_pattern = Column(Text, nullable=False)
+    reasoning_pattern: Mapped[str] = mapped_column(Text)
 
-    created_at = Column(DateTime, default=datetime.now)
-    last_used = Column(DateTime, default=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    last_used: Mapped[datetime] = mapped_column(server_default=func.now())
 
 
 # ════════════════════════════════════════════════════════════════
@@ -304,23 +359,34 @@ class ContentGuardLog(Base):
 
     __tablename__ = "content_guard_logs"
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    generation_id = Column(String(50), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    generation_id: Mapped[str] = mapped_column(String(50), index=True)
 
     # Document info
-    document_source = Column(String(200), nullable=False)
-    document_snippet = Column(Text, nullable=False)
+    document_source: Mapped[str] = mapped_column(String(200))
+    document_snippet: Mapped[str] = mapped_column(Text)
 
     # Checks
-    toxicity_score = Column(Float, nullable=False)
-    policy_compliant = Column(Boolean, nullable=False)
-    quality_passed = Column(Boolean, nullable=False)
+    toxicity_score: Mapped[float] = mapped_column()
+    policy_compliant: Mapped[bool] = mapped_column()
+    quality_passed: Mapped[bool] = mapped_column()
 
     # Result
-    filtered = Column(Boolean, nullable=False, index=True)
-    filter_reason = Column(String(100), nullable=True)
-
-    created_at = Column(DateTime, default=datetime.now)
+    filtered: Mapped[bool] = mapped_column(index=True)
+    filter_reason: Mapped[str | None] = mapped_column(String(100))
+
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+    # Dashboards mostly look at filtered rows of one generation.
+    __table_args__ = (
+        Index(
+            "ix_cgl_gen_filtered",
+            "generation_id",
+            "filtered",
+            postgresql_where=text("filtered IS TRUE"),
+            sqlite_where=text("filtered IS TRUE"),
+        ),
+    )
 
 
 # ════════════════════════════════════════════════════════════════
@@ -333,28 +399,28 @@ class SystemHealthMetric(Base):
 
     __tablename__ = "system_health_metrics"
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    timestamp = Column(DateTime, default=datetime.now, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    timestamp: Mapped[datetime] = mapped_column(server_default=func.now(), index=True)
 
     # Component availability (0-1)
-    gigachat2_max_available = Column(Float, default=1.0)
-    gigachat3_available = Column(Float, default=1.0)
-    chromadb_available = Column(Float, default=1.0)
-    fourget_available = Column(Float, default=1.0)
-    redis_available = Column(Float, default=1.0)
+    gigachat2_max_available: Mapped[float] = mapped_column(default=1.0)
+    gigachat3_available: Mapped[float] = mapped_column(default=1.0)
+    chromadb_available: Mapped[float] = mapped_column(default=1.0)
+    fourget_available: Mapped[float] = mapped_column(default=1.0)
+    redis_available: Mapped[float] = mapped_column(default=1.0)
 
     # Latencies (ms)
-    gigachat2_max_avg_latency = Column(Float, default=0.0)
-    gigachat3_avg_latency = Column(Float, default=0.0)
-    chromadb_avg_latency = Column(Float, default=0.0)
+    gigachat2_max_avg_latency: Mapped[float] = mapped_column(default=0.0)
+    gigachat3_avg_latency: Mapped[float] = mapped_column(default=0.0)
+    chromadb_avg_latency: Mapped[float] = mapped_column(default=0.0)
 
     # Rates (per minute)
-    request_rate = Column(Float, default=0.0)
-    success_rate = Column(Float, default=0.0)
-    error_rate = Column(Float, default=0.0)
+    request_rate: Mapped[float] = mapped_column(default=0.0)
+    success_rate: Mapped[float] = mapped_column(default=0.0)
+    error_rate: Mapped[float] = mapped_column(default=0.0)
 
     # Costs (last hour)
-    estimated_cost_last_hour = Column(Float, default=0.0)
+    estimated_cost_last_hour: Mapped[float] = mapped_column(default=0.0)
 
 
 # ════════════════════════════════════════════════════════════════
@@ -363,18 +429,87 @@ class SystemHealthMetric(Base):
 
 settings = get_settings()
 
+_IS_SQLITE = settings.database.database_url.startswith("sqlite")
+
+
+def _set_sqlite_pragmas(dbapi_conn, _connection_record) -> None:
+    """Настроить каждое пул-соединение SQLite при открытии.
+
+    WAL позволяет читателям работать параллельно с писателем,
+    synchronous=NORMAL убирает fsync на каждый COMMIT (достаточно для WAL),
+    mmap даёт zero-copy чтение страниц, cache_size=-65536 — 64 МБ page cache.
+    """
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+
+# sqlite3 keeps an LRU of prepared statements per connection; the default of
+# 128 is tight once all the logging/metrics tables are in play.
+_CONNECT_ARGS = {"cached_statements": 256} if _IS_SQLITE else {}
+
+
+def _json_serializer(value) -> str:
+    return orjson.dumps(value).decode()
+
+
+# JSON-колонки (extra_data, tool_params, knowledge_areas, ...) кодируются
+# C-реализацией orjson вместо stdlib json — меньше CPU на каждый insert.
+_JSON_ENGINE_KWARGS = {
+    "json_serializer": _json_serializer,
+    "json_deserializer": orjson.loads,
+}
+
 # Create async engine (rename to async_engine)
+# Explicit pool sizing: the defaults (5 + 10 overflow) cause head-of-line
+# blocking under concurrent generations. Warm connections also skip the
+# per-open cost (file open + PRAGMAs on SQLite, TCP/TLS on PostgreSQL);
+# pre_ping discards connections that died while idle and recycle bounds
+# their lifetime below typical server/proxy idle timeouts.
+_POOL_KWARGS = {
+    "pool_size": 20,
+    "max_overflow": 40,
+    "pool_timeout": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
 async_engine = create_async_engine(
-    settings.database.database_url, echo=settings.database.database_echo, future=True
+    settings.database.database_url,
+    echo=settings.database.database_echo,
+    future=True,
+    connect_args=_CONNECT_ARGS,
+    # Larger insertmanyvalues pages for the bulk fallback-migration path
+    insertmanyvalues_page_size=1000,
+    # Compiled-statement cache above the default 500: the ORM emits enough
+    # distinct statements across the logging/metrics tables to thrash it.
+    query_cache_size=1200,
+    **_JSON_ENGINE_KWARGS,
+    **_POOL_KWARGS,
 )
 
 # Create async session factory
 AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
 # Create sync engine (rename to sync_engine)
-sync_engine = create_engine(settings.database.database_url, echo=False)
+sync_engine = create_engine(
+    settings.database.database_url,
+    echo=False,
+    connect_args=_CONNECT_ARGS,
+    query_cache_size=1200,
+    **_JSON_ENGINE_KWARGS,
+    **_POOL_KWARGS,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
 
+if _IS_SQLITE:
+    event.listens_for(sync_engine, "connect")(_set_sqlite_pragmas)
+    event.listens_for(async_engine.sync_engine, "connect")(_set_sqlite_pragmas)
+
 
 @contextmanager
 def get_db_session() -> Generator[Session]:
@@ -395,35 +530,180 @@ def init_database() -> None:
     Base.metadata.create_all(bind=sync_engine)
 
 
+# Горячий запрос: строим (и компилируем) statement один раз на модуль,
+# значение подставляется через bindparam при выполнении.
+_user_insert = sqlite_insert(User).values(user_id=bindparam("uid"))
+_USER_UPSERT = _user_insert.on_conflict_do_update(
+    index_elements=[User.user_id], set_={"user_id": _user_insert.excluded.user_id}
+).returning(User)
+
+
 def get_or_create_user(user_id: str) -> User:
-    """Получить или создать пользователя."""
+    """Получить или создать пользователя одним UPSERT-запросом.
+
+    SELECT + условный INSERT — это два-три обращения к БД и гонка между
+    ними; ON CONFLICT ... RETURNING делает то же за один запрос.
+    """
     with get_db_session() as session:
-        user = session.query(User).filter(User.user_id == user_id).first()
-        if not user:
-            user = User(user_id=user_id)
-            session.add(user)
-            session.commit()
-        return user
+        return session.scalars(_USER_UPSERT, {"uid": user_id}).one()
+
+
+# Both legacy startup hooks call init_db; the DDL pass only needs to run once.
+_db_initialized = False
 
 
 async def init_db() -> None:
     """Initialize database (create tables)."""
-    settings = get_settings()
+    global _db_initialized  # noqa: PLW0603
+    if _db_initialized:
+        return
 
-    # Create engine in function scope
-    engine = create_async_engine(
-        settings.database.database_url, echo=settings.database.database_echo, future=True
-    )
-
-    async with engine.begin() as conn:
+    # create_all runs every CREATE TABLE/INDEX inside one transaction on the
+    # shared module engine — no throwaway engine per call.
+    async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
-    # Dispose before function returns
-    await engine.dispose()
-
+    _db_initialized = True
     logger.info("✅ Database initialized")
 
 
+async def bulk_insert_logs(db: AsyncSession, model_class: type[Base], rows: list[dict]) -> int:
+    """Пакетная вставка лог-записей (ToT-ноды, content-guard и т.п.).
+
+    На PostgreSQL использует COPY через raw-соединение asyncpg — это
+    обходит парсинг INSERT на каждую строку и даёт кратно большую
+    пропускную способность; на SQLite остаётся executemany через Core
+    insert. В обоих случаях — одна команда вместо session.add_all.
+    """
+    if not rows:
+        return 0
+
+    if db.get_bind().dialect.name == "postgresql":
+        columns = list(rows[0])
+        records = [tuple(row[c] for c in columns) for row in rows]
+        raw_conn = await (await db.connection()).get_raw_connection()
+        await raw_conn.driver_connection.copy_records_to_table(
+            model_class.__tablename__, records=records, columns=columns
+        )
+    else:
+        await db.execute(insert(model_class), rows)
+
+    return len(rows)
+
+
+async def bulk_insert_tot_nodes(db: AsyncSession, rows: list[dict]) -> int:
+    """Сбросить накопленные ToT-ноды одной пакетной вставкой.
+
+    Генератор за один прогон создаёт десятки-сотни нод; вместо
+    session.add на каждую — накапливаем словари по ходу обхода дерева и
+    отправляем их сюда одним executemany/COPY в конце генерации.
+    """
+    return await bulk_insert_logs(db, ToTNodeLog, rows)
+
+
+# Статистика инструментов: вызовы агрегируются в памяти процесса и
+# сбрасываются одним UPSERT на ключ (tool_name, date) — счётчики и
+# min/max/avg пересчитывает сама БД, вместо SELECT-then-UPDATE на каждый
+# вызов инструмента.
+_tool_usage_buffer: dict[tuple[str, str], dict[str, float]] = {}
+
+_tool_stats_insert = sqlite_insert(ToolUsageStats).values(
+    tool_name=bindparam("tool_name"),
+    date=bindparam("date"),
+    total_calls=bindparam("n"),
+    successful_calls=bindparam("ok"),
+    failed_calls=bindparam("fail"),
+    avg_execution_time_ms=bindparam("avg_ms"),
+    min_execution_time_ms=bindparam("min_ms"),
+    max_execution_time_ms=bindparam("max_ms"),
+    fallback_triggered_count=bindparam("fallback"),
+)
+_TOOL_STATS_UPSERT = _tool_stats_insert.on_conflict_do_update(
+    index_elements=[ToolUsageStats.tool_name, ToolUsageStats.date],
+    set_={
+        "total_calls": ToolUsageStats.total_calls + bindparam("n"),
+        "successful_calls": ToolUsageStats.successful_calls + bindparam("ok"),
+        "failed_calls": ToolUsageStats.failed_calls + bindparam("fail"),
+        # new_avg = (old_avg * old_n + sum_new) / (old_n + new_n)
+        "avg_execution_time_ms": (
+            ToolUsageStats.avg_execution_time_ms * ToolUsageStats.total_calls
+            + bindparam("sum_ms")
+        )
+        / (ToolUsageStats.total_calls + bindparam("n")),
+        "min_execution_time_ms": func.min(
+            ToolUsageStats.min_execution_time_ms, bindparam("min_ms")
+        ),
+        "max_execution_time_ms": func.max(
+            ToolUsageStats.max_execution_time_ms, bindparam("max_ms")
+        ),
+        "fallback_triggered_count": ToolUsageStats.fallback_triggered_count
+        + bindparam("fallback"),
+        "updated_at": func.now(),
+    },
+)
+
+
+def record_tool_call(
+    tool_name: str,
+    *,
+    success: bool,
+    execution_time_ms: float,
+    fallback_triggered: bool = False,
+) -> None:
+    """Накопить вызов инструмента в буфере процесса (без обращения к БД)."""
+    key = (tool_name, datetime.now().strftime("%Y-%m-%d"))
+    agg = _tool_usage_buffer.get(key)
+    if agg is None:
+        agg = _tool_usage_buffer[key] = {
+            "n": 0,
+            "ok": 0,
+            "fail": 0,
+            "sum_ms": 0.0,
+            "min_ms": float("inf"),
+            "max_ms": 0.0,
+            "fallback": 0,
+        }
+    agg["n"] += 1
+    agg["ok" if success else "fail"] += 1
+    agg["sum_ms"] += execution_time_ms
+    agg["min_ms"] = min(agg["min_ms"], execution_time_ms)
+    agg["max_ms"] = max(agg["max_ms"], execution_time_ms)
+    if fallback_triggered:
+        agg["fallback"] += 1
+
+
+async def flush_tool_usage_stats(db: AsyncSession) -> int:
+    """Сбросить накопленную статистику одним UPSERT на (tool_name, date).
+
+    Returns:
+        Количество обновлённых ключей
+    """
+    if not _tool_usage_buffer:
+        return 0
+
+    drained = list(_tool_usage_buffer.items())
+    _tool_usage_buffer.clear()
+
+    for (tool_name, date_key), agg in drained:
+        await db.execute(
+            _TOOL_STATS_UPSERT,
+            {
+                "tool_name": tool_name,
+                "date": date_key,
+                "n": agg["n"],
+                "ok": agg["ok"],
+                "fail": agg["fail"],
+                "avg_ms": agg["sum_ms"] / agg["n"],
+                "sum_ms": agg["sum_ms"],
+                "min_ms": agg["min_ms"],
+                "max_ms": agg["max_ms"],
+                "fallback": agg["fallback"],
+            },
+        )
+
+    return len(drained)
+
+
 async def get_db() -> AsyncSession:
     """Get database session (dependency)."""
     async with AsyncSessionLocal() as session:
@@ -2,15 +2,26 @@
 ChromaDB fallback strategies.
 """
 
+import heapq
 import logging
+import math
 import operator
 import pickle
+import re
+from array import array
+from collections.abc import Iterator
 from pathlib import Path
 
 from langchain_core.documents import Document
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r"\w+")
+
+# BM25 constants (standard Okapi values)
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
 
 class ChromaDBFallbackHandler:
     """
@@ -26,6 +37,9 @@ class ChromaDBFallbackHandler:
         """
         self.fallback_dir = Path(fallback_dir)
         self.fallback_dir.mkdir(parents=True, exist_ok=True)
+        # Unpickled index per collection, keyed by file mtime: repeat queries
+        # reuse the precomputed tokenization instead of re-reading the file.
+        self._index_cache: dict[str, tuple[float, dict]] = {}
         logger.info(f"📁 ChromaDB fallback directory: {self.fallback_dir}")
 
     def save_documents_fallback(self, documents: list[Document], collection_name: str) -> bool:
@@ -43,18 +57,13 @@ class ChromaDBFallbackHandler:
         try:
             fallback_file = self.fallback_dir / f"{collection_name}_documents.pkl"
 
-            # Load existing if present
-            existing = []
-            if fallback_file.exists():
-                with Path(fallback_file).open("rb") as f:
-                    existing = pickle.load(f)
-
-            # Append new documents
-            existing.extend(documents)
+            # Append-only: each save writes one self-delimiting pickle frame,
+            # so the cost is O(len(documents)) regardless of how much is
+            # already on disk — no load-extend-rewrite of the whole file.
+            with Path(fallback_file).open("ab") as f:
+                pickle.dump(documents, f, protocol=pickle.HIGHEST_PROTOCOL)
 
-            # Save
-            with Path(fallback_file).open("wb") as f:
-                pickle.dump(existing, f)
+            self._update_index(documents, collection_name)
 
             logger.info(f"✅ Saved {len(documents)} documents to fallback: {fallback_file}")
             return True
@@ -63,33 +72,112 @@ class ChromaDBFallbackHandler:
             logger.exception(f"❌ Failed to save fallback: {e}")
             return False
 
-    def load_documents_fallback(self, collection_name: str) -> list[Document]:
+    def _index_file(self, collection_name: str) -> Path:
+        return self.fallback_dir / f"{collection_name}_index.pkl"
+
+    def _load_index(self, collection_name: str) -> dict | None:
+        """Load the persisted inverted index, or None if absent/corrupt."""
+        index_file = self._index_file(collection_name)
+        if not index_file.exists():
+            return None
+        try:
+            mtime = index_file.stat().st_mtime
+            cached = self._index_cache.get(collection_name)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            with index_file.open("rb") as f:
+                index = pickle.load(f)
+            self._index_cache[collection_name] = (mtime, index)
+            return index
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load fallback index: {e}")
+            return None
+
+    def _update_index(self, documents: list[Document], collection_name: str) -> None:
+        """Incrementally extend the inverted index with a new batch.
+
+        Postings are token -> array of interleaved (doc_id, tf) pairs; doc
+        ids follow the append order of the frame stream, so the index only
+        ever grows in step with the document file.
         """
-        Load documents from fallback pickle file.
+        try:
+            index = self._load_index(collection_name) or {"postings": {}, "doc_lens": array("I")}
+            postings: dict[str, array] = index["postings"]
+            doc_lens: array = index["doc_lens"]
+
+            for doc in documents:
+                doc_id = len(doc_lens)
+                tokens = _TOKEN_RE.findall(doc.page_content.lower())
+                doc_lens.append(len(tokens))
+                counts: dict[str, int] = {}
+                for token in tokens:
+                    counts[token] = counts.get(token, 0) + 1
+                for token, tf in counts.items():
+                    posting = postings.get(token)
+                    if posting is None:
+                        posting = postings[token] = array("I")
+                    posting.append(doc_id)
+                    posting.append(tf)
+
+            index_file = self._index_file(collection_name)
+            with index_file.open("wb") as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._index_cache[collection_name] = (index_file.stat().st_mtime, index)
+        except Exception as e:
+            # The index is an accelerator; the document stream stays the
+            # source of truth, so indexing failures are non-fatal.
+            logger.warning(f"⚠️ Failed to update fallback index: {e}")
+
+    def iter_documents_fallback(self, collection_name: str) -> Iterator[Document]:
+        """
+        Stream documents from the fallback pickle file.
+
+        Only one frame (one save batch) is resident at a time, so memory
+        stays bounded by the largest batch rather than the whole
+        collection; callers that need a few documents can stop early.
 
         Args:
             collection_name: Collection name
 
-        Returns:
-            List of documents
+        Yields:
+            Documents in append order
         """
 
         fallback_file = self.fallback_dir / f"{collection_name}_documents.pkl"
 
         if not fallback_file.exists():
             logger.debug(f"📂 No fallback file: {fallback_file}")
-            return []
+            return
 
         try:
-            with Path(fallback_file).open("rb") as f:
-                documents = pickle.load(f)
-
-            logger.info(f"✅ Loaded {len(documents)} documents from fallback")
-            return documents
+            # The file is a stream of pickle frames (one list per save call);
+            # old single-frame files load the same way. A 1 MiB read buffer
+            # amortizes syscalls across the many small frame reads.
+            with Path(fallback_file).open("rb", buffering=1 << 20) as f:
+                while True:
+                    try:
+                        yield from pickle.load(f)
+                    except EOFError:
+                        break
 
         except Exception as e:
             logger.exception(f"❌ Failed to load fallback: {e}")
-            return []
+
+    def load_documents_fallback(self, collection_name: str) -> list[Document]:
+        """
+        Load documents from fallback pickle file.
+
+        Args:
+            collection_name: Collection name
+
+        Returns:
+            List of documents
+        """
+
+        documents = list(self.iter_documents_fallback(collection_name))
+        if documents:
+            logger.info(f"✅ Loaded {len(documents)} documents from fallback")
+        return documents
 
     def search_fallback(self, query: str, collection_name: str, k: int = 5) -> list[Document]:
         """
@@ -104,38 +192,77 @@ class ChromaDBFallbackHandler:
             List of matching documents
         """
 
-        documents = self.load_documents_fallback(collection_name)
-
-        if not documents:
-            return []
-
-        # Simple keyword-based scoring
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
-
-        scored_docs = []
-
-        for doc in documents:
-            content_lower = doc.page_content.lower()
-            content_words = set(content_lower.split())
-
-            # Jaccard similarity
-            intersection = len(query_words & content_words)
-            union = len(query_words | content_words)
-            score = intersection / union if union > 0 else 0.0
-
-            scored_docs.append((doc, score))
-
-        # Sort by score
-        scored_docs.sort(key=operator.itemgetter(1), reverse=True)
-
-        # Return top k
-        results = [doc for doc, score in scored_docs[:k]]
+        # Preferred path: BM25 over the persisted inverted index — only
+        # documents containing a query token are scored, and a single
+        # streaming pass picks the winning documents out of the file
+        # without materializing the collection.
+        index = self._load_index(collection_name)
+        if index:
+            top_ids = self._bm25_top_k(query, index, k)
+            wanted = set(top_ids)
+            found: dict[int, Document] = {}
+            total = 0
+            for doc_id, doc in enumerate(self.iter_documents_fallback(collection_name)):
+                total += 1
+                if doc_id in wanted:
+                    found[doc_id] = doc
+            if total == len(index["doc_lens"]):
+                results = [found[doc_id] for doc_id in top_ids if doc_id in found]
+                logger.info(f"✅ Fallback search returned {len(results)} documents (indexed)")
+                return results
+            # Stale index (doc count mismatch): fall through to the scan.
+
+        # Simple keyword-based scoring, streamed through a bounded top-k
+        # heap: O(N log k) and O(k) memory instead of sorting a full
+        # (doc, score) list.
+        query_words = set(query.lower().split())
+        n_query_words = len(query_words)
+
+        def _scored() -> Iterator[tuple[float, Document]]:
+            for doc in self.iter_documents_fallback(collection_name):
+                content_words = set(doc.page_content.lower().split())
+
+                # Jaccard similarity via inclusion-exclusion: the union size
+                # follows from the two set sizes and the intersection, so no
+                # merged set is built per document.
+                intersection = len(query_words & content_words)
+                union = n_query_words + len(content_words) - intersection
+                score = intersection / union if union > 0 else 0.0
+
+                yield (score, doc)
+
+        top = heapq.nlargest(k, _scored(), key=operator.itemgetter(0))
+        results = [doc for _score, doc in top]
 
         logger.info(f"✅ Fallback search returned {len(results)} documents")
 
         return results
 
+    @staticmethod
+    def _bm25_top_k(query: str, index: dict, k: int) -> list[int]:
+        """Score query candidates with Okapi BM25 and return top-k doc ids."""
+        postings: dict[str, array] = index["postings"]
+        doc_lens: array = index["doc_lens"]
+        n_docs = len(doc_lens)
+        avgdl = sum(doc_lens) / n_docs if n_docs else 1.0
+
+        scores: dict[int, float] = {}
+        for token in set(_TOKEN_RE.findall(query.lower())):
+            posting = postings.get(token)
+            if posting is None:
+                continue
+            df = len(posting) // 2
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for i in range(0, len(posting), 2):
+                doc_id = posting[i]
+                tf = posting[i + 1]
+                norm = _BM25_K1 * (1.0 - _BM25_B + _BM25_B * doc_lens[doc_id] / avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                    tf * (_BM25_K1 + 1.0) / (tf + norm)
+                )
+
+        return heapq.nlargest(k, scores, key=scores.__getitem__)
+
     def clear_fallback(self, collection_name: str) -> bool:
         """
         Clear fallback file for collection.
@@ -154,6 +281,8 @@ class ChromaDBFallbackHandler:
 
         try:
             fallback_file.unlink()
+            self._index_file(collection_name).unlink(missing_ok=True)
+            self._index_cache.pop(collection_name, None)
             logger.info(f"🗑️ Cleared fallback: {fallback_file}")
             return True
         except Exception as e:
@@ -2,22 +2,49 @@
 Database fallback strategies.
 """
 
-import json
 import logging
+from datetime import date, datetime
 from pathlib import Path
 from typing import Any
 
+import orjson
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
+# Per-model-class serialization plan: (column names, datetime columns).
+# Walking record.__table__.columns and probing hasattr(value, "isoformat")
+# on every save is pure interpreter overhead; the table layout is static,
+# so classify it once per class.
+_COL_CACHE: dict[type, tuple[tuple[str, ...], frozenset[str]]] = {}
+
+
+def _column_plan(model_class: type) -> tuple[tuple[str, ...], frozenset[str]]:
+    """Get (column_names, datetime_columns) for a model class, cached."""
+    plan = _COL_CACHE.get(model_class)
+    if plan is None:
+        names = []
+        dt_cols = set()
+        for column in model_class.__table__.columns:  # type: ignore[attr-defined]
+            names.append(column.name)
+            try:
+                if issubclass(column.type.python_type, (datetime, date)):
+                    dt_cols.add(column.name)
+            except NotImplementedError:
+                pass
+        plan = _COL_CACHE[model_class] = (tuple(names), frozenset(dt_cols))
+    return plan
+
 
 class DatabaseFallbackHandler:
     """
     Handle database failures with fallback to JSON files.
     """
 
+    MIGRATION_BATCH_SIZE = 1000
+
     def __init__(self, fallback_dir: str = "./data/fallback") -> None:
         """
         Initialize database fallback handler.
@@ -62,28 +89,20 @@ class DatabaseFallbackHandler:
         """Save record to JSON file."""
 
         try:
-            # Convert SQLAlchemy model to dict
-            record_dict = {}
-            for column in record.__table__.columns:
-                value = getattr(record, column.name)
-                # Handle special types
-                if hasattr(value, "isoformat"):
-                    value = value.isoformat()
-                record_dict[column.name] = value
+            # Convert SQLAlchemy model to dict using the cached column plan
+            names, dt_cols = _column_plan(type(record))
+            record_dict = {name: getattr(record, name) for name in names}
+            for name in dt_cols:
+                value = record_dict[name]
+                record_dict[name] = value.isoformat() if value is not None else None
 
-            # Save to JSON
-            fallback_file = self.fallback_dir / f"{fallback_name}.json"
+            # Append-only JSONL: each save writes exactly one line, so the
+            # cost stays O(1) per record instead of rewriting the whole
+            # file (quadratic I/O over the fallback's lifetime).
+            fallback_file = self.fallback_dir / f"{fallback_name}.jsonl"
 
-            # Append to existing file if it exists
-            existing_data = []
-            if fallback_file.exists():
-                with Path(fallback_file).open(encoding="utf-8") as f:
-                    existing_data = json.load(f)
-
-            existing_data.append(record_dict)
-
-            with Path(fallback_file).open("w", encoding="utf-8") as f:
-                json.dump(existing_data, f, indent=2, default=str)
+            with Path(fallback_file).open("ab") as f:
+                f.write(orjson.dumps(record_dict, default=str) + b"\n")
 
             logger.info(f"✅ Saved to fallback JSON: {fallback_file}")
             return True
@@ -103,15 +122,17 @@ class DatabaseFallbackHandler:
             List of record dicts
         """
 
-        fallback_file = self.fallback_dir / f"{fallback_name}.json"
+        fallback_file = self.fallback_dir / f"{fallback_name}.jsonl"
 
         if not fallback_file.exists():
             logger.debug(f"📂 No fallback file: {fallback_file}")
             return []
 
         try:
-            with Path(fallback_file).open(encoding="utf-8") as f:
-                data = json.load(f)
+            # One record per line; streaming keeps memory bounded by the
+            # largest record, not the whole file.
+            with Path(fallback_file).open("rb") as f:
+                data = [orjson.loads(line) for line in f if line.strip()]
 
             logger.info(f"✅ Loaded {len(data)} records from fallback: {fallback_file}")
             return data
@@ -135,35 +156,46 @@ class DatabaseFallbackHandler:
             Number of migrated records
         """
 
-        records = await self.load_from_fallback(fallback_name)
+        fallback_file = self.fallback_dir / f"{fallback_name}.jsonl"
 
-        if not records:
+        if not fallback_file.exists():
             return 0
 
         migrated = 0
 
-        for record_dict in records:
-            try:
-                # Create model instance
-                record = model_class(**record_dict)
-                db.add(record)
-                migrated += 1
-
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to migrate record: {e}")
-                continue
-
         try:
+            # Core bulk path: one executemany/insertmanyvalues per batch of
+            # dicts instead of per-row ORM unit-of-work (identity map,
+            # change tracking, per-object flush). The JSONL file is streamed
+            # line-by-line, so migration handles files larger than RAM.
+            stmt = insert(model_class)
+            batch: list[dict[str, Any]] = []
+            with Path(fallback_file).open("rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    batch.append(orjson.loads(line))
+                    if len(batch) >= self.MIGRATION_BATCH_SIZE:
+                        await db.execute(stmt, batch)
+                        migrated += len(batch)
+                        batch = []
+            if batch:
+                await db.execute(stmt, batch)
+                migrated += len(batch)
+
+            if not migrated:
+                return 0
+
             await db.commit()
-            logger.info(f"✅ Migrated {migrated}/{len(records)} records")
+            logger.info(f"✅ Migrated {migrated} records")
 
             # Delete fallback file after successful migration
-            fallback_file = self.fallback_dir / f"{fallback_name}.json"
             fallback_file.unlink()
             logger.info(f"🗑️ Deleted fallback file: {fallback_file}")
 
         except Exception as e:
-            logger.exception(f"❌ Migration commit failed: {e}")
+            logger.exception(f"❌ Migration failed: {e}")
             await db.rollback()
+            return 0
 
         return migrated
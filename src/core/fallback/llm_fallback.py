@@ -2,17 +2,31 @@
 LLM fallback strategies.
 """
 
+import asyncio
+import hashlib
 import logging
-import time
+import random
 from collections.abc import Callable
 from functools import wraps
 
 from langchain_core.language_models import BaseChatModel
 
+from src.core.cache.memory_cache import MemoryCache
 from src.exceptions import LLMUnavailableError
 
 logger = logging.getLogger(__name__)
 
+# Shared bounded response cache keyed by (model, prompt) hash: for idempotent
+# prompts (classification, rubric scoring) a repeat call skips the network
+# round-trip and the retry machinery entirely.
+_response_cache = MemoryCache(max_size=4096, default_ttl=3600)
+
+
+def _response_cache_key(llm: BaseChatModel, prompt: str) -> str:
+    model_key = llm.__class__.__name__ + str(getattr(llm, "model", ""))
+    digest = hashlib.blake2b((model_key + prompt).encode("utf-8"), digest_size=16).hexdigest()
+    return f"llm_response:{digest}"
+
 
 class LLMFallbackHandler:
     """
@@ -61,10 +75,18 @@ class LLMFallbackHandler:
             LLMUnavailableError: If all fallbacks fail
         """
 
+        # Strategy #3 from the docstring: identical (model, prompt) pairs are
+        # served from the cache without touching the network.
+        cache_key = _response_cache_key(primary_llm, prompt)
+        cached_response = _response_cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
+
         # Try primary LLM with retries
         for attempt in range(self.max_retries):
             try:
                 response = await primary_llm.ainvoke(prompt, **kwargs)
+                _response_cache.set(cache_key, response.content)
                 return response.content
 
             except Exception as e:
@@ -73,10 +95,13 @@ class LLMFallbackHandler:
                 )
 
                 if attempt < self.max_retries - 1:
-                    # Exponential backoff
-                    delay = self.base_delay * (2**attempt)
-                    logger.info(f"⏳ Retrying in {delay}s...")
-                    time.sleep(delay)
+                    # Exponential backoff with jitter; asyncio.sleep yields
+                    # the event loop instead of blocking every other request,
+                    # and the jitter spreads retries when the upstream LLM
+                    # recovers.
+                    delay = self.base_delay * (2**attempt) * (0.5 + random.random() * 0.5)
+                    logger.info(f"⏳ Retrying in {delay:.1f}s...")
+                    await asyncio.sleep(delay)
                 else:
                     logger.exception("❌ Primary LLM exhausted all retries")
 
@@ -86,7 +111,8 @@ class LLMFallbackHandler:
             try:
                 response = await fallback_llm.ainvoke(prompt, **kwargs)
                 logger.info("✅ Fallback LLM succeeded")
-                return response.page_content
+                _response_cache.set(cache_key, response.content)
+                return response.content
             except Exception as e:
                 logger.exception(f"❌ Fallback LLM also failed: {e}")
 
@@ -3,9 +3,13 @@ LLM provider management with model routing.
 Code from Section 2.2 of architecture.
 """
 
+import asyncio
 import logging
+from collections.abc import Callable
 from enum import StrEnum
+from functools import lru_cache
 
+import httpx
 from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 
@@ -14,6 +18,54 @@ from src.exceptions import LLMUnavailableError
 
 logger = logging.getLogger(__name__)
 
+# Один HTTP-пул на процесс для всех ChatOpenAI: иначе каждая модель держит
+# собственный httpx-клиент (свой keepalive-пул, свои TLS-handshake'и) к тому
+# же gigachat_base_url.
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+
+@lru_cache(maxsize=1)
+def _shared_async_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(limits=_HTTP_LIMITS)
+
+
+@lru_cache(maxsize=1)
+def _shared_sync_http_client() -> httpx.Client:
+    return httpx.Client(limits=_HTTP_LIMITS)
+
+
+async def close_llm_http_clients() -> None:
+    """Закрыть общие HTTP-клиенты (вызывается при shutdown приложения)."""
+    if _shared_async_http_client.cache_info().currsize:
+        await _shared_async_http_client().aclose()
+    if _shared_sync_http_client.cache_info().currsize:
+        _shared_sync_http_client().close()
+
+
+@lru_cache(maxsize=8)
+def _make_chat_openai(
+    model: str, temperature: float, timeout: int, *, cache: bool = False
+) -> ChatOpenAI:
+    """Построить (и закэшировать) ChatOpenAI для данной конфигурации.
+
+    Каждый конструктор ChatOpenAI поднимает собственный httpx-клиент с
+    connection pool — кэш по (model, temperature, timeout) даёт один клиент
+    на конфигурацию на процесс. Ключ/URL берутся из настроек внутри, чтобы
+    секрет не попадал в ключ lru_cache.
+    """
+    settings = get_settings()
+    return ChatOpenAI(
+        api_key=settings.llm.gigachat_api_key,  # pyright: ignore[reportArgumentType]
+        base_url=settings.llm.gigachat_base_url,
+        model=model,
+        temperature=temperature,
+        timeout=timeout,
+        max_retries=2,
+        http_client=_shared_sync_http_client(),
+        http_async_client=_shared_async_http_client(),
+        cache=cache,
+    )
+
 
 class TaskType(StrEnum):
     """Types of tasks for LLM routing."""
@@ -45,8 +97,38 @@ class LLMRouter:
     def __init__(self) -> None:
         """Initialize LLM router."""
         self.settings = get_settings()
-        self._gigachat_max_instance = None
-        self._gigachat3_instance = None
+        self._setup_llm_cache()
+        # Диспатч-таблица, построенная один раз: get_model_for_task вызывается
+        # на каждый ToT-узел, membership-проверка и ветвление уходят в lookup.
+        self._task_to_getter: dict[TaskType, Callable[[], BaseChatModel]] = {
+            task: (
+                (lambda: self.gigachat_max)
+                if task in self.HIGH_COST_TASKS
+                else (lambda: self.gigachat3)
+            )
+            for task in TaskType
+        }
+
+    def _setup_llm_cache(self) -> None:
+        """Включить SQLite-кэш ответов для детерминированных вызовов.
+
+        Low-cost задачи (валидация, guard-проверки) идут с temperature=0 и
+        повторяются между сессиями — локальный кэш отдаёт их за микросекунды
+        вместо сетевого вызова. Кэшируется только gigachat3 (cache=True);
+        генерация с temperature>0 остаётся без кэша.
+        """
+        try:
+            from pathlib import Path
+
+            from langchain_community.cache import SQLiteCache
+            from langchain_core.globals import set_llm_cache
+
+            cache_db = Path(self.settings.cache.llm_cache_db)
+            cache_db.parent.mkdir(parents=True, exist_ok=True)
+            set_llm_cache(SQLiteCache(database_path=str(cache_db)))
+            logger.info(f"✅ LLM response cache enabled: {cache_db}")
+        except Exception as e:
+            logger.warning(f"⚠️ LLM response cache unavailable: {e}")
 
     def get_model_for_task(self, task_type: TaskType) -> BaseChatModel:
         """
@@ -74,11 +156,8 @@ class LLMRouter:
             LLMUnavailableError: If model initialization fails
         """
 
-        if task_type in self.HIGH_COST_TASKS:
-            logger.debug(f"Using GigaChat-2-Max for {task_type.value}")
-            return self.gigachat_max
-        logger.debug(f"Using GigaChat3 for {task_type.value}")
-        return self.gigachat3
+        logger.debug("Routing task %s", task_type.value)
+        return self._task_to_getter[task_type]()
 
     @property
     def gigachat_max(self) -> BaseChatModel:
@@ -88,23 +167,15 @@ class LLMRouter:
         Returns:
             GigaChat-2-Max model instance
         """
-        if self._gigachat_max_instance is None:
-            try:
-                self._gigachat_max_instance = ChatOpenAI(
-                    api_key=self.settings.llm.gigachat_api_key,  # pyright: ignore[reportArgumentType]
-                    base_url=self.settings.llm.gigachat_base_url,
-                    model=self.settings.llm.gigachat_model,
-                    temperature=self.settings.llm.gigachat_temperature,
-                    # max_tokens=self.settings.llm.gigachat_max_tokens,
-                    timeout=self.settings.llm.gigachat_timeout_s,
-                    max_retries=2,
-                )
-                logger.info("✅ GigaChat-2-Max initialized")
-            except Exception as e:
-                logger.exception(f"❌ Failed to initialize GigaChat-2-Max: {e}")
-                raise LLMUnavailableError(model="GigaChat-2-Max", message=str(e))
-
-        return self._gigachat_max_instance
+        try:
+            return _make_chat_openai(
+                self.settings.llm.gigachat_model,
+                self.settings.llm.gigachat_temperature,
+                self.settings.llm.gigachat_timeout_s,
+            )
+        except Exception as e:
+            logger.exception(f"❌ Failed to initialize GigaChat-2-Max: {e}")
+            raise LLMUnavailableError(model="GigaChat-2-Max", message=str(e))
 
     @property
     def gigachat3(self) -> BaseChatModel:
@@ -114,23 +185,30 @@ class LLMRouter:
         Returns:
             GigaChat3 model instance
         """
-        if self._gigachat3_instance is None:
-            try:
-                self._gigachat3_instance = ChatOpenAI(
-                    api_key=self.settings.llm.gigachat_api_key,  # pyright: ignore[reportArgumentType]
-                    base_url=self.settings.llm.gigachat_base_url,
-                    model=self.settings.llm.gigachat3_model,
-                    temperature=self.settings.llm.gigachat3_temperature,
-                    # max_tokens=self.settings.llm.gigachat3_max_tokens,
-                    timeout=self.settings.llm.gigachat3_timeout_s,
-                    max_retries=2,
-                )
-                logger.info("✅ GigaChat3 initialized")
-            except Exception as e:
-                logger.exception(f"❌ Failed to initialize GigaChat3: {e}")
-                raise LLMUnavailableError(model="GigaChat3", message=str(e))
-
-        return self._gigachat3_instance
+        try:
+            return _make_chat_openai(
+                self.settings.llm.gigachat3_model,
+                self.settings.llm.gigachat3_temperature,
+                self.settings.llm.gigachat3_timeout_s,
+                cache=True,
+            )
+        except Exception as e:
+            logger.exception(f"❌ Failed to initialize GigaChat3: {e}")
+            raise LLMUnavailableError(model="GigaChat3", message=str(e))
+
+    async def prewarm(self) -> None:
+        """Построить оба ChatOpenAI-клиента параллельно при старте.
+
+        Холодный старт иначе платит за конструктор (httpx-клиент, TLS)
+        дважды последовательно — на первом thought_generation и первом
+        input_validation. Здесь обе инициализации укладываются в одно
+        wall-clock окно до первого запроса.
+        """
+        await asyncio.gather(
+            asyncio.to_thread(lambda: self.gigachat_max),
+            asyncio.to_thread(lambda: self.gigachat3),
+        )
+        logger.info("🔥 LLM router prewarmed (GigaChat-2-Max, GigaChat3)")
 
     def _get_gigachat_max(self) -> BaseChatModel:
         """Get GigaChat-2-Max instance (legacy method)."""
@@ -141,16 +219,10 @@ class LLMRouter:
         return self.gigachat3
 
 
-# Global router instance
-_router = None
-
-
+@lru_cache(maxsize=1)
 def get_llm_router() -> LLMRouter:
-    """Get global LLM router instance."""
-    global _router
-    if _router is None:
-        _router = LLMRouter()
-    return _router
+    """Get global LLM router instance (thread-safe lazy singleton)."""
+    return LLMRouter()
 
 
 def get_llm(use_gigachat3: bool = False) -> BaseChatModel:
@@ -2,17 +2,15 @@
 Database logging handler for storing application logs in PostgreSQL/SQLite.
 """
 
+import asyncio
 import logging
 import traceback
+from collections import deque
 from datetime import datetime
-from typing import TYPE_CHECKING
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Integer, String, Text
+from sqlalchemy import JSON, Boolean, Column, DateTime, Integer, String, Text, insert
 
-from src.core.database import AsyncSessionLocal, Base
-
-if TYPE_CHECKING:
-    from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.database import Base, async_engine
 
 
 class ApplicationLog(Base):
@@ -105,12 +103,38 @@ class ToolExecutionLog(Base):
 
 
 class DatabaseHandler(logging.Handler):
-    """Async logging handler that saves logs to database."""
+    """Async logging handler that saves logs to database in batches."""
+
+    # One INSERT + COMMIT per record pays a round trip and an fsync per log
+    # line; records are queued instead and flushed by a background task in
+    # multi-row batches.
+    BATCH_SIZE = 256
+    FLUSH_INTERVAL = 0.05  # seconds
+
+    # Records emitted before the loop is attached are stashed here (bounded,
+    # oldest dropped) and flushed into the queue by attach_loop.
+    PENDING_LIMIT = 1000
 
     def __init__(self, level=logging.INFO) -> None:
         super().__init__(level)
-        self._session: AsyncSession | None = None
         self._context = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[dict] | None = None
+        self._drain_task: asyncio.Task | None = None
+        self._pending: deque[dict] = deque(maxlen=self.PENDING_LIMIT)
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """Bind the handler to the event loop and start the drain task.
+
+        Called from async startup; also flushes records that were emitted
+        before the loop existed.
+        """
+        self._loop = loop or asyncio.get_running_loop()
+        if self._drain_task is None or self._drain_task.done():
+            self._queue = asyncio.Queue()
+            self._drain_task = self._loop.create_task(self._drain_loop())
+        while self._pending:
+            self._queue.put_nowait(self._pending.popleft())
 
     def set_context(self, **kwargs) -> None:
         """Set context variables (user_id, session_id, etc.)."""
@@ -120,90 +144,189 @@ class DatabaseHandler(logging.Handler):
         """Clear context variables."""
         self._context.clear()
 
+    _STANDARD_ATTRS = frozenset({
+        "name",
+        "msg",
+        "args",
+        "created",
+        "filename",
+        "funcName",
+        "levelname",
+        "lineno",
+        "module",
+        "msecs",
+        "message",
+        "pathname",
+        "process",
+        "processName",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+    })
+
+    _JSON_SAFE_TYPES = (str, int, float, bool, list, dict, type(None))
+
     def emit(self, record: logging.LogRecord) -> None:
         """
         Emit a record to database.
-        This method is called synchronously, so we queue it for async processing.
+        This method is called synchronously, so we queue it for batched
+        async processing.
         """
         try:
-            # Import here to avoid circular dependency
-            import asyncio
-
-            # Try to get current event loop
-            try:
-                loop = asyncio.get_running_loop()
-                # Schedule the async task
-                loop.create_task(self._async_emit(record))
-            except RuntimeError:
-                # No event loop running, create new one (fallback)
-                asyncio.run(self._async_emit(record))
+            # Build the row synchronously so the queue holds a plain dict
+            # and the LogRecord itself is not retained.
+            row = self._record_to_row(record)
+
+            # The loop is captured once in attach_loop — no per-record
+            # get_running_loop probe and no asyncio.run fallback spinning up
+            # a throwaway loop for sync-context logs.
+            loop = self._loop
+            if loop is not None and loop.is_running():
+                loop.call_soon_threadsafe(self._queue.put_nowait, row)
+            else:
+                self._pending.append(row)
 
         except Exception:
             self.handleError(record)
 
-    async def _async_emit(self, record: logging.LogRecord) -> None:
-        """Async method to save log to database."""
+    def _record_to_row(self, record: logging.LogRecord) -> dict:
+        """Convert a LogRecord to an application_logs row dict."""
+        row = {
+            "timestamp": datetime.fromtimestamp(record.created),
+            "level": record.levelname,
+            "logger_name": record.name,
+            "module": record.module,
+            "function_name": record.funcName,
+            "line_number": record.lineno,
+            "message": record.getMessage(),
+            "user_id": self._context.get("user_id"),
+            "session_id": self._context.get("session_id"),
+            "request_id": self._context.get("request_id"),
+            "exception_type": None,
+            "exception_message": None,
+            "stack_trace": None,
+            "extra_data": None,
+        }
+
+        # Add exception info if present. Only the cheap name/message are
+        # extracted here; the multi-KB traceback string is rendered lazily
+        # at flush time (_format_stack_traces), off the emit hot path.
+        if record.exc_info:
+            exc_type, exc_value, _exc_tb = record.exc_info
+            row["exception_type"] = exc_type.__name__ if exc_type else None
+            row["exception_message"] = str(exc_value) if exc_value else None
+            row["_exc_info"] = record.exc_info
+
+        # Add extra data if present; only JSON-safe values, so one odd
+        # extra (e.g. an exception object) can't fail the whole batch write.
+        extra_data = {
+            key: value
+            for key, value in record.__dict__.items()
+            if key not in self._STANDARD_ATTRS and isinstance(value, self._JSON_SAFE_TYPES)
+        }
+        if extra_data:
+            row["extra_data"] = extra_data
+
+        return row
+
+    async def _drain_loop(self) -> None:
+        """Drain the queue, flushing up to BATCH_SIZE rows per transaction."""
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                while len(batch) < self.BATCH_SIZE:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), self.FLUSH_INTERVAL)
+                    )
+            except TimeoutError:
+                pass
+            await self._write_batch(batch)
+
+    async def _write_batch(self, rows: list[dict]) -> None:
+        """Insert a batch of log rows in one executemany transaction.
+
+        Core insert on a raw connection: log rows are write-only, so the
+        Session's identity map and unit-of-work bookkeeping are pure
+        overhead here.
+        """
         try:
-            async with AsyncSessionLocal() as session:
-                log_entry = ApplicationLog(
-                    timestamp=datetime.fromtimestamp(record.created),
-                    level=record.levelname,
-                    logger_name=record.name,
-                    module=record.module,
-                    function_name=record.funcName,
-                    line_number=record.lineno,
-                    message=record.getMessage(),
-                    user_id=self._context.get("user_id"),
-                    session_id=self._context.get("session_id"),
-                    request_id=self._context.get("request_id"),
-                )
-
-                # Add exception info if present
-                if record.exc_info:
-                    exc_type, exc_value, _exc_tb = record.exc_info
-                    log_entry.exception_type = exc_type.__name__ if exc_type else None
-                    log_entry.exception_message = str(exc_value) if exc_value else None
-                    log_entry.stack_trace = "".join(traceback.format_exception(*record.exc_info))
-
-                # Add extra data if present
-                extra_data = {
-                    key: value
-                    for key, value in record.__dict__.items()
-                    if key
-                    not in {
-                        "name",
-                        "msg",
-                        "args",
-                        "created",
-                        "filename",
-                        "funcName",
-                        "levelname",
-                        "lineno",
-                        "module",
-                        "msecs",
-                        "message",
-                        "pathname",
-                        "process",
-                        "processName",
-                        "relativeCreated",
-                        "thread",
-                        "threadName",
-                        "exc_info",
-                        "exc_text",
-                        "stack_info",
-                    }
-                }
-
-                if extra_data:
-                    log_entry.extra_data = extra_data
-
-                session.add(log_entry)
-                await session.commit()
-
+            deferred = [row for row in rows if "_exc_info" in row]
+            if deferred:
+                # CPU-bound string rendering runs in a worker thread so the
+                # drain task doesn't stall the loop on traceback-heavy bursts.
+                await asyncio.to_thread(self._format_stack_traces, deferred)
+            async with async_engine.begin() as conn:
+                await conn.execute(insert(ApplicationLog.__table__), rows)
         except Exception as e:
             # Don't raise exceptions from logging handler
             print(f"Error saving log to database: {e}")
 
+    # Hard cap so a pathological recursion trace can't bloat a row.
+    _STACK_TRACE_LIMIT = 16 * 1024
+
+    @classmethod
+    def _format_stack_traces(cls, rows: list[dict]) -> None:
+        """Render deferred exc_info tuples into stack_trace strings."""
+        for row in rows:
+            exc_info = row.pop("_exc_info")
+            try:
+                trace = "".join(traceback.format_exception(*exc_info))
+                row["stack_trace"] = trace[: cls._STACK_TRACE_LIMIT]
+            except Exception:
+                row["stack_trace"] = None
+
+
+# Shared batcher for the auxiliary log tables (LLM calls, tool executions):
+# the hot path only enqueues a row dict; one background consumer groups rows
+# by table and writes each group with a single executemany + commit.
+_LOG_QUEUE: asyncio.Queue[tuple[type, dict]] | None = None
+_log_drain_task: asyncio.Task | None = None
+_LOG_BATCH_SIZE = 256
+_LOG_FLUSH_INTERVAL = 0.05  # seconds
+
+
+def _enqueue_log(model_class: type, row: dict) -> None:
+    """Queue a log row for the shared background writer."""
+    global _LOG_QUEUE, _log_drain_task  # noqa: PLW0603
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    if _log_drain_task is None or _log_drain_task.done():
+        _LOG_QUEUE = asyncio.Queue()
+        _log_drain_task = loop.create_task(_drain_log_queue())
+    _LOG_QUEUE.put_nowait((model_class, row))
+
+
+async def _drain_log_queue() -> None:
+    """Flush queued log rows in per-table executemany batches."""
+    while True:
+        items = [await _LOG_QUEUE.get()]
+        try:
+            while len(items) < _LOG_BATCH_SIZE:
+                items.append(await asyncio.wait_for(_LOG_QUEUE.get(), _LOG_FLUSH_INTERVAL))
+        except TimeoutError:
+            pass
+
+        # One datetime.now() per batch instead of one Column-default call
+        # per row; the sub-50ms skew within a batch is below what the log
+        # consumers care about.
+        now = datetime.now()
+        by_table: dict[type, list[dict]] = {}
+        for model_class, row in items:
+            row.setdefault("timestamp", now)
+            by_table.setdefault(model_class, []).append(row)
+
+        try:
+            async with async_engine.begin() as conn:
+                for model_class, rows in by_table.items():
+                    await conn.execute(insert(model_class.__table__), rows)
+        except Exception as e:
+            print(f"Error saving logs to database: {e}")
+
 
 class LLMCallLogger:
     """Helper class for logging LLM calls."""
@@ -223,30 +346,29 @@ class LLMCallLogger:
         estimated_cost_usd: float | None = None,
         **context,
     ) -> None:
-        """Log LLM API call to database."""
+        """Queue LLM API call for the background database writer."""
         try:
-            async with AsyncSessionLocal() as session:
-                log_entry = LLMCallLog(
-                    model_name=model_name,
-                    task_type=task_type,
-                    prompt=prompt[:10000],  # Limit prompt size
-                    response=response[:10000] if response else None,
-                    latency_ms=latency_ms,
-                    success=success,
-                    error_message=error_message,
-                    prompt_tokens=prompt_tokens,
-                    completion_tokens=completion_tokens,
-                    total_tokens=total_tokens,
-                    estimated_cost_usd=int(estimated_cost_usd * 100)
+            _enqueue_log(
+                LLMCallLog,
+                {
+                    "model_name": model_name,
+                    "task_type": task_type,
+                    "prompt": prompt[:10000],  # Limit prompt size
+                    "response": response[:10000] if response else None,
+                    "latency_ms": latency_ms,
+                    "success": success,
+                    "error_message": error_message,
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": total_tokens,
+                    "estimated_cost_usd": int(estimated_cost_usd * 100)
                     if estimated_cost_usd
                     else None,
-                    user_id=context.get("user_id"),
-                    session_id=context.get("session_id"),
-                    generation_id=context.get("generation_id"),
-                )
-
-                session.add(log_entry)
-                await session.commit()
+                    "user_id": context.get("user_id"),
+                    "session_id": context.get("session_id"),
+                    "generation_id": context.get("generation_id"),
+                },
+            )
 
         except Exception as e:
             print(f"Error logging LLM call: {e}")
@@ -266,24 +388,23 @@ class ToolExecutionLogger:
         result_summary: str | None = None,
         **context,
     ) -> None:
-        """Log tool execution to database."""
+        """Queue tool execution for the background database writer."""
         try:
-            async with AsyncSessionLocal() as session:
-                log_entry = ToolExecutionLog(
-                    tool_name=tool_name,
-                    tool_params=tool_params,
-                    execution_time_ms=execution_time_ms,
-                    success=success,
-                    error_message=error_message,
-                    documents_retrieved=documents_retrieved,
-                    result_summary=result_summary[:1000] if result_summary else None,
-                    node_id=context.get("node_id"),
-                    generation_id=context.get("generation_id"),
-                    session_id=context.get("session_id"),
-                )
-
-                session.add(log_entry)
-                await session.commit()
+            _enqueue_log(
+                ToolExecutionLog,
+                {
+                    "tool_name": tool_name,
+                    "tool_params": tool_params,
+                    "execution_time_ms": execution_time_ms,
+                    "success": success,
+                    "error_message": error_message,
+                    "documents_retrieved": documents_retrieved,
+                    "result_summary": result_summary[:1000] if result_summary else None,
+                    "node_id": context.get("node_id"),
+                    "generation_id": context.get("generation_id"),
+                    "session_id": context.get("session_id"),
+                },
+            )
 
         except Exception as e:
             print(f"Error logging tool execution: {e}")
@@ -304,6 +425,12 @@ def setup_database_logging(level=logging.INFO):
         root_logger = logging.getLogger()
         root_logger.addHandler(_db_handler)
 
+    try:
+        _db_handler.attach_loop()
+    except RuntimeError:
+        # No loop yet: records buffer until attach_loop runs at startup.
+        pass
+
     return _db_handler
 
 
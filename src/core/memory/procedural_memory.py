@@ -2,6 +2,7 @@
 Procedural Memory Store.
 """
 
+import asyncio
 import json
 import logging
 import uuid
@@ -9,11 +10,16 @@ from datetime import datetime
 from typing import Any
 
 from src.config import get_settings
+from src.core.cache.memory_cache import MemoryCache
 from src.core.memory.memory_schemas import ProceduralPattern
 from src.exceptions import MemoryError
 
 logger = logging.getLogger(__name__)
 
+# Короткоживущий кэш результатов поиска: горячие запросы (одинаковые темы в
+# ToT-ветках) иначе каждый раз платят за embedding + ANN-поиск.
+_search_cache = MemoryCache(max_size=512, default_ttl=300)
+
 
 class ProceduralMemoryStore:
     """
@@ -68,20 +74,25 @@ class ProceduralMemoryStore:
             if not pattern.pattern_id:
                 pattern.pattern_id = f"pat_{uuid.uuid4().hex[:12]}"
 
-            # Serialize pattern
-            pattern_json = pattern.model_dump_json()
-
-            # Store in ChromaDB (with embedding on reasoning_pattern)
-            self.collection.upsert(
+            # Store in ChromaDB (with embedding on reasoning_pattern).
+            # Fields live as native scalar metadata instead of one
+            # pattern_json blob, so counters can be updated in place
+            # without re-embedding the document. Embedding runs in a
+            # worker thread so the event loop stays free.
+            await asyncio.to_thread(
+                self.collection.upsert,
                 documents=[pattern.reasoning_pattern],  # This will be embedded
                 ids=[pattern.pattern_id],
                 metadatas=[
                     {
-                        "pattern_json": pattern_json,
                         "category": pattern.topic_category,
                         "level": pattern.user_level,
+                        "tools_sequence": "|".join(pattern.tools_sequence),
+                        "avg_iterations": pattern.avg_iterations,
                         "success_score": pattern.success_score,
+                        "usage_count": pattern.usage_count,
                         "created_at": pattern.created_at.isoformat(),
+                        "last_used": pattern.last_used.isoformat(),
                     }
                 ],
             )
@@ -114,34 +125,65 @@ class ProceduralMemoryStore:
             logger.warning("⚠️ ChromaDB unavailable, returning empty patterns")
             return []
 
+        cache_key = f"{query.strip().lower()}|{limit}|{round(min_success_score, 2)}"
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            # Search by semantic similarity
-            results = self.collection.query(
+            # Search by semantic similarity. Chroma's client is synchronous,
+            # so run the embed+ANN step off the event loop; include only what
+            # we read back (default include ships embeddings and distances).
+            results = await asyncio.to_thread(
+                self.collection.query,
                 query_texts=[query],
                 n_results=limit * 2,  # Get more for filtering
                 where={"success_score": {"$gte": min_success_score}},
+                include=["metadatas", "documents"],
             )
 
             if not results or not results["metadatas"]:
                 logger.info(f"No patterns found for query: {query[:50]}...")
                 return []
 
-            # Parse patterns
+            # Parse patterns (first query results)
             patterns = []
-            for metadata in results["metadatas"][0]:  # First query results
-                pattern_json = metadata.get("pattern_json")
-                if pattern_json:
-                    pattern_dict = json.loads(pattern_json)
-                    patterns.append(pattern_dict)
+            for idx, metadata in enumerate(results["metadatas"][0]):
+                pattern_id = results["ids"][0][idx]
+                document = results["documents"][0][idx] if results.get("documents") else ""
+                patterns.append(self._pattern_from_metadata(pattern_id, metadata, document))
 
             logger.info(f"📚 Found {len(patterns)} similar patterns")
 
-            return patterns[:limit]
+            patterns = patterns[:limit]
+            _search_cache.set(cache_key, patterns)
+            return patterns
 
         except Exception as e:
             logger.exception(f"❌ Failed to find patterns: {e}")
             return []
 
+    @staticmethod
+    def _pattern_from_metadata(pattern_id: str, metadata: dict, document: str) -> dict[str, Any]:
+        """Rebuild a pattern dict from structured Chroma metadata."""
+        # Legacy entries saved before structured metadata
+        pattern_json = metadata.get("pattern_json")
+        if pattern_json:
+            return json.loads(pattern_json)
+
+        return {
+            "pattern_id": pattern_id,
+            "topic_category": metadata.get("category", ""),
+            "user_level": metadata.get("level", ""),
+            "tools_sequence": [t for t in metadata.get("tools_sequence", "").split("|") if t],
+            "avg_iterations": metadata.get("avg_iterations", 0.0),
+            "success_score": metadata.get("success_score", 0.0),
+            "usage_count": metadata.get("usage_count", 1),
+            "reasoning_pattern": document,
+            "created_at": metadata.get("created_at", ""),
+            "last_used": metadata.get("last_used", ""),
+        }
+
     async def increment_usage(self, pattern_id: str) -> None:
         """
         Increment usage count for a pattern.
@@ -155,28 +197,37 @@ class ProceduralMemoryStore:
 
         try:
             # Get current pattern
-            result = self.collection.get(ids=[pattern_id])
+            result = await asyncio.to_thread(self.collection.get, ids=[pattern_id])
 
             if not result or not result["metadatas"]:
                 logger.warning(f"⚠️ Pattern {pattern_id} not found")
                 return
 
-            # Parse pattern
             metadata = result["metadatas"][0]
-            pattern_json = metadata.get("pattern_json")
 
-            if not pattern_json:
-                return
-
-            pattern_dict = json.loads(pattern_json)
-
-            # Increment usage
-            pattern_dict["usage_count"] = pattern_dict.get("usage_count", 0) + 1
-            pattern_dict["last_used"] = datetime.now().isoformat()
-
-            # Update
-            pattern = ProceduralPattern(**pattern_dict)
-            await self.save_pattern(pattern)
+            # Legacy blob entries keep their counters inside pattern_json;
+            # unpack once so the update below migrates them in place.
+            pattern_json = metadata.pop("pattern_json", None)
+            if pattern_json:
+                pattern_dict = json.loads(pattern_json)
+                metadata = {
+                    "category": pattern_dict.get("topic_category", ""),
+                    "level": pattern_dict.get("user_level", ""),
+                    "tools_sequence": "|".join(pattern_dict.get("tools_sequence", [])),
+                    "avg_iterations": pattern_dict.get("avg_iterations", 0.0),
+                    "success_score": pattern_dict.get("success_score", 0.0),
+                    "usage_count": pattern_dict.get("usage_count", 0),
+                    "created_at": pattern_dict.get("created_at", ""),
+                    "last_used": pattern_dict.get("last_used", ""),
+                }
+
+            # Metadata-only update: the document is untouched, so no
+            # embedding inference runs for a counter bump.
+            metadata["usage_count"] = int(metadata.get("usage_count", 0)) + 1
+            metadata["last_used"] = datetime.now().isoformat()
+            await asyncio.to_thread(
+                self.collection.update, ids=[pattern_id], metadatas=[metadata]
+            )
 
             logger.debug(f"📈 Incremented usage for {pattern_id}")
 
@@ -3,9 +3,11 @@ Working Memory Store.
 Code from Section 8.3 of architecture.
 """
 
-import json
+import asyncio
 import logging
 
+import orjson
+
 from src.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -17,10 +19,21 @@ class WorkingMemoryStore:
     Code from Section 8.3 of architecture.
     """
 
+    # Одна collection.add на шаг — это полная SQLite-транзакция на строку.
+    # Шаги копятся в буфере по session_id и пишутся пачкой: по достижении
+    # BATCH_SIZE либо фоновым таймером раз в FLUSH_INTERVAL секунд.
+    BATCH_SIZE = 100
+    FLUSH_INTERVAL = 0.2  # seconds
+
     def __init__(self) -> None:
         self.settings = get_settings()
         self.chromadb_available = True
         self.in_memory_fallback: dict[str, list[dict]] = {}  # {session_id: list[steps]}
+        self._pending: dict[str, list[tuple[str, dict, dict]]] = {}  # (id, step, meta)
+        self._flush_task: asyncio.Task | None = None
+        # Декодированный контекст сессии: ToT читает его на каждом раскрытии
+        # узла, и без кэша каждый вызов — это Chroma get + json.loads на шаг.
+        self._ctx_cache: dict[str, list[dict]] = {}
 
         # Try to initialize ChromaDB
         try:
@@ -55,22 +68,28 @@ class WorkingMemoryStore:
         """
 
         if self.chromadb_available:
-            try:
-                # Store in ChromaDB
-                doc_id = f"{session_id}_{step_data['iteration']}"
-
-                self.collection.add(
-                    documents=[json.dumps(step_data)],
-                    ids=[doc_id],
-                    metadatas=[{"session_id": session_id, "iteration": step_data["iteration"]}],
+            doc_id = f"{session_id}_{step_data['iteration']}"
+            metadata = {"session_id": session_id, "iteration": step_data["iteration"]}
+            self._pending.setdefault(session_id, []).append((doc_id, step_data, metadata))
+
+            # Keep the decoded context warm instead of invalidating it:
+            # iterations are monotonic, so appending preserves order.
+            cached = self._ctx_cache.get(session_id)
+            if cached is not None:
+                cached.append(step_data)
+
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.get_running_loop().create_task(
+                    self._periodic_flush()
                 )
 
-                logger.debug(f"📝 Stored step {step_data['iteration']} for {session_id}")
-                return
+            if len(self._pending[session_id]) >= self.BATCH_SIZE:
+                # On flush failure the batch lands in the in-memory fallback,
+                # so the step is preserved either way.
+                await self._flush(session_id)
 
-            except Exception as e:
-                logger.warning(f"⚠️ ChromaDB write failed: {e}, using in-memory")
-                self.chromadb_available = False
+            logger.debug(f"📝 Buffered step {step_data['iteration']} for {session_id}")
+            return
 
         # FALLBACK: In-memory storage
         if session_id not in self.in_memory_fallback:
@@ -79,6 +98,43 @@ class WorkingMemoryStore:
         self.in_memory_fallback[session_id].append(step_data)
         logger.debug(f"📝 In-memory: stored step for {session_id}")
 
+    async def _flush(self, session_id: str) -> None:
+        """Write the session's buffered steps with one collection.add."""
+        batch = self._pending.pop(session_id, None)
+        if not batch:
+            return
+
+        try:
+            await asyncio.to_thread(
+                self.collection.add,
+                documents=[orjson.dumps(step).decode() for _, step, _ in batch],
+                ids=[doc_id for doc_id, _, _ in batch],
+                metadatas=[meta for _, _, meta in batch],
+            )
+            logger.debug(f"📝 Flushed {len(batch)} steps for {session_id}")
+
+        except Exception as e:
+            logger.warning(f"⚠️ ChromaDB write failed: {e}, using in-memory")
+            self.chromadb_available = False
+            self.in_memory_fallback.setdefault(session_id, []).extend(
+                step for _, step, _ in batch
+            )
+
+    async def _periodic_flush(self) -> None:
+        """Фоновый таймер: сбрасывает все сессии раз в FLUSH_INTERVAL."""
+        while self.chromadb_available:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            for session_id in list(self._pending):
+                await self._flush(session_id)
+
+    async def close(self) -> None:
+        """Flush all pending steps and stop the background flusher."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        for session_id in list(self._pending):
+            await self._flush(session_id)
+
     async def get_session_context(self, session_id: str) -> list[dict]:
         """
         Retrieve all steps for session.
@@ -91,14 +147,26 @@ class WorkingMemoryStore:
         """
 
         if self.chromadb_available:
+            cached = self._ctx_cache.get(session_id)
+            if cached is not None:
+                return list(cached)
+
             try:
                 results = self.collection.get(where={"session_id": session_id})
 
-                if results and results["documents"]:
-                    steps = [json.loads(doc) for doc in results["documents"]]
+                steps = (
+                    [orjson.loads(doc) for doc in results["documents"]]
+                    if results and results["documents"]
+                    else []
+                )
+                # Buffered steps haven't reached Chroma yet but are part of
+                # the session context.
+                steps.extend(step for _, step, _ in self._pending.get(session_id, []))
+                if steps:
                     # Sort by iteration
                     steps.sort(key=lambda x: x.get("iteration", 0))
-                    return steps
+                    self._ctx_cache[session_id] = steps
+                    return list(steps)
 
             except Exception as e:
                 logger.warning(f"⚠️ ChromaDB read failed: {e}, using in-memory")
@@ -114,6 +182,11 @@ class WorkingMemoryStore:
             session_id: Session ID
         """
 
+        # Buffered-but-unwritten steps would otherwise be flushed back in
+        # after the delete below.
+        self._pending.pop(session_id, None)
+        self._ctx_cache.pop(session_id, None)
+
         if self.chromadb_available:
             try:
                 self.collection.delete(where={"session_id": session_id})
@@ -4,6 +4,7 @@ Code from Section 8.2 of architecture.
 """
 
 import logging
+import re
 import uuid
 
 from src.config import get_settings
@@ -14,6 +15,29 @@ from src.models.react_schemas import ToTResult
 
 logger = logging.getLogger(__name__)
 
+_CATEGORY_KEYWORDS = {
+    "sorting": ["сортировка", "quicksort", "mergesort", "heapsort", "bubble sort"],
+    "graphs": ["граф", "дейкстра", "bfs", "dfs", "кратчайший путь", "поиск в ширину"],
+    "dynamic_programming": ["динамическое программирование", "мемоизация", "рюкзак"],
+    "data_structures": ["структура данных", "дерево", "хеш", "стек", "очередь"],
+    "complexity": ["сложность", "big o", "время выполнения", "асимптотика"],
+    "recursion": ["рекурсия", "рекурсивный"],
+    "greedy": ["жадный алгоритм", "greedy"],
+}
+
+# Один скомпилированный альтернационный паттерн вместо вложенных substring-
+# проверок по всем ключевым словам на каждый запрос. Порядок категорий в
+# _CATEGORY_KEYWORDS остаётся приоритетом при нескольких совпадениях.
+_KEYWORD_TO_CATEGORY = {
+    keyword: category
+    for category, keywords in _CATEGORY_KEYWORDS.items()
+    for keyword in keywords
+}
+_CATEGORY_PRIORITY = {category: rank for rank, category in enumerate(_CATEGORY_KEYWORDS)}
+_CATEGORY_RE = re.compile(
+    "|".join(re.escape(kw) for kw in sorted(_KEYWORD_TO_CATEGORY, key=len, reverse=True))
+)
+
 
 class MemoryManager:
     """
@@ -49,7 +73,6 @@ class MemoryManager:
 
         if self.settings.features.feature_procedural_memory_enabled:
             try:
-                self._detect_category(query)
                 patterns = await self.procedural_memory.find_similar_patterns(query=query, limit=3)
 
                 if patterns:
@@ -132,21 +155,12 @@ class MemoryManager:
             Category string
         """
 
-        categories = {
-            "sorting": ["сортировка", "quicksort", "mergesort", "heapsort", "bubble sort"],
-            "graphs": ["граф", "дейкстра", "bfs", "dfs", "кратчайший путь", "поиск в ширину"],
-            "dynamic_programming": ["динамическое программирование", "мемоизация", "рюкзак"],
-            "data_structures": ["структура данных", "дерево", "хеш", "стек", "очередь"],
-            "complexity": ["сложность", "big O", "время выполнения", "асимптотика"],
-            "recursion": ["рекурсия", "рекурсивный"],
-            "greedy": ["жадный алгоритм", "greedy"],
+        matched = {
+            _KEYWORD_TO_CATEGORY[match.group(0)]
+            for match in _CATEGORY_RE.finditer(query.lower())
         }
-
-        query_lower = query.lower()
-
-        for category, keywords in categories.items():
-            if any(kw in query_lower for kw in keywords):
-                return category
+        if matched:
+            return min(matched, key=_CATEGORY_PRIORITY.__getitem__)
 
         return "general"
 
@@ -164,15 +178,17 @@ class MemoryManager:
         if not patterns:
             return "No prior patterns available"
 
-        hints = "## Успешные стратегии из памяти:\n\n"
+        parts = ["## Успешные стратегии из памяти:\n\n"]
 
         for i, pattern in enumerate(patterns, 1):
-            hints += f"{i}. **{pattern.get('topic_category', 'Unknown')}** (успех: {pattern.get('success_score', 0):.2f})\n"
-            hints += f"   - Инструменты: {' → '.join(pattern.get('tools_sequence', []))}\n"
-            hints += f"   - Итераций: ~{pattern.get('avg_iterations', 0):.0f}\n"
-            hints += f"   - Стратегия: {pattern.get('reasoning_pattern', '')[:100]}...\n\n"
+            parts.append(
+                f"{i}. **{pattern.get('topic_category', 'Unknown')}** (успех: {pattern.get('success_score', 0):.2f})\n"
+            )
+            parts.append(f"   - Инструменты: {' → '.join(pattern.get('tools_sequence', []))}\n")
+            parts.append(f"   - Итераций: ~{pattern.get('avg_iterations', 0):.0f}\n")
+            parts.append(f"   - Стратегия: {pattern.get('reasoning_pattern', '')[:100]}...\n\n")
 
-        return hints
+        return "".join(parts)
 
     def _extract_reasoning(self, path: list) -> str:
         """
@@ -2,7 +2,6 @@ import chromadb
 from chromadb.config import Settings as ChromaSettings
 from langchain_chroma.vectorstores import Chroma
 from langchain_core.documents import Document
-from langchain_huggingface import HuggingFaceEmbeddings
 
 from src.config import get_settings
 
@@ -13,9 +12,8 @@ class VectorStoreManager:
     """Менеджер для работы с ChromaDB."""
 
     def __init__(self) -> None:
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
-        )
+        # Общий эмбеддер из настроек — модель грузится один раз на процесс.
+        self.embeddings = settings.embedding.embeddings
         self.client = chromadb.PersistentClient(
             path=settings.memory.chroma_persist_directory,
             settings=ChromaSettings(anonymized_telemetry=False),
@@ -65,6 +63,43 @@ class VectorStoreManager:
         """Поиск похожих документов."""
         return self.vectorstore.similarity_search(query=query, k=k, filter=filter_dict)
 
+    def similarity_search_batch(
+        self,
+        queries: list[str],
+        k: int = settings.adaptive_rag.rag_top_k,
+        filter_dict: dict | None = None,
+    ) -> list[list[Document]]:
+        """Поиск похожих документов сразу для нескольких запросов.
+
+        Все запросы кодируются одним batched forward-проходом эмбеддера и
+        уходят в Chroma одним query-вызовом — вместо N последовательных
+        similarity_search для сиблинг-веток ToT.
+        """
+        if not queries:
+            return []
+
+        # Одинаковые запросы (повторяющиеся ветки) эмбеддятся один раз.
+        unique = list(dict.fromkeys(queries))
+        qvecs = self.embeddings.embed_documents(unique)
+
+        results = self.vectorstore._collection.query(  # noqa: SLF001
+            query_embeddings=qvecs,
+            n_results=k,
+            where=filter_dict,
+            include=["documents", "metadatas"],
+        )
+
+        per_query: dict[str, list[Document]] = {}
+        for idx, query in enumerate(unique):
+            docs = results["documents"][idx] or []
+            metas = results["metadatas"][idx] or [None] * len(docs)
+            per_query[query] = [
+                Document(page_content=doc, metadata=meta or {})
+                for doc, meta in zip(docs, metas, strict=False)
+            ]
+
+        return [per_query[query] for query in queries]
+
     def similarity_search_with_score(
         self, query: str, k: int = settings.adaptive_rag.rag_top_k, filter_dict: dict | None = None
     ) -> list[tuple[Document, float]]:
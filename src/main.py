@@ -14,6 +14,7 @@ from starlette.responses import Response
 
 from src.config import get_settings
 from src.core.database import init_db
+from src.core.llm import close_llm_http_clients, get_llm_router
 from src.core.logging_handler import get_db_handler, setup_database_logging
 from src.routers import (
     health,
@@ -103,10 +104,19 @@ async def lifespan(app: FastAPI):
     # Initialize database
     await init_db()
 
+    # Warm up LLM chains and the worker HTTP pool off the first request's path
+    import asyncio
+
+    from src.agents.orchestrator.orchestrator import warmup
+
+    asyncio.create_task(warmup())
+    asyncio.create_task(get_llm_router().prewarm())
+
     yield
 
     # Shutdown
     logger.info("🛑 Shutting down...")
+    await close_llm_http_clients()
 
 
 # Create FastAPI app
@@ -157,8 +167,12 @@ async def root():
 
 
 if __name__ == "__main__":
+    import asyncio
+
     import uvicorn
+    import uvloop
 
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     uvicorn.run(
         "src.main:app",
         host=settings.api.api_host,
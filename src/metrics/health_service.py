@@ -135,9 +135,9 @@ class HealthService:
         """Check Redis availability."""
 
         try:
-            from src.core.cache.redis_cache import RedisCache
+            from src.core.cache.redis_cache import get_redis_cache
 
-            cache = RedisCache()
+            cache = get_redis_cache()
 
             if not cache.enabled:
                 return {
@@ -1,4 +1,3 @@
-import json
 import uuid
 from typing import Any
 
@@ -205,7 +204,7 @@ async def start_assessment(request: AssessmentStartRequest) -> AssessmentStartRe
         assessment_session = AssessmentSession(
             session_id=session_id,
             user_id=request.user_id,
-            questions=json.dumps(ASSESSMENT_QUESTIONS),
+            questions=ASSESSMENT_QUESTIONS,
         )
         session.add(assessment_session)
 
@@ -227,7 +226,7 @@ async def submit_assessment(request: AssessmentSubmitRequest) -> AssessmentSubmi
             user_id: str = "unknown"
         else:
             user_id = assessment_session.user_id
-            questions = json.loads(assessment_session.questions)
+            questions = assessment_session.questions
 
     correct_count: int = 0
 
@@ -287,8 +286,8 @@ async def submit_assessment(request: AssessmentSubmitRequest) -> AssessmentSubmi
             user_id=user_id,
             session_id=request.session_id,
             level=level,
-            knowledge_areas=json.dumps(knowledge_areas),
-            recommendations=json.dumps(recommendations),
+            knowledge_areas=knowledge_areas,
+            recommendations=recommendations,
         )
         session.add(assessment)
 
@@ -316,7 +315,7 @@ async def get_assessment_results(user_id: str) -> GetAssessmentResultsResponse:
         return GetAssessmentResultsResponse(
             user_id=user_id,
             initial_level=result.level,
-            knowledge_areas=json.loads(result.knowledge_areas) if result.knowledge_areas else {},
-            recommendations=json.loads(result.recommendations) if result.recommendations else [],
+            knowledge_areas=result.knowledge_areas or {},
+            recommendations=result.recommendations or [],
             completed_at=result.completed_at.isoformat(),
         )
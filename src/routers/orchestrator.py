@@ -1,11 +1,18 @@
 from fastapi import APIRouter, HTTPException
 
-from ..agents.orchestrator.orchestrator import orchestrator
+from ..agents.orchestrator.orchestrator import orchestrator, warmup
 from ..models.orchestrator_schemas import ResolveRequest, ResolveResponse
 
 router = APIRouter(prefix="/api/v1/orchestrator", tags=["Orchestrator"])
 
 
+@router.post("/warmup")
+async def warmup_orchestrator() -> dict[str, str]:
+    """Прогреть цепочки и HTTP-пул (для пре-ротации за балансировщиком)."""
+    await warmup()
+    return {"status": "warmed"}
+
+
 @router.post("/resolve")
 async def resolve_complex_task(request: ResolveRequest) -> ResolveResponse:
     """
@@ -53,7 +53,7 @@ async def get_support(request: SupportRequest) -> SupportResponse:
                 user_message=request.message,
                 emotional_state=request.emotional_state,
                 response=support_message,
-                recommendations=json.dumps(recommendations),
+                recommendations=recommendations,
             )
             session.add(support_session)
 
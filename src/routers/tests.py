@@ -68,7 +68,7 @@ async def generate_test(request: GenerateTestRequest) -> GenerateTestResponse:
                 test_id=test_id,
                 topic=request.topic,
                 difficulty=request.difficulty,
-                questions=json.dumps([q.model_dump() for q in questions]),
+                questions=[q.model_dump() for q in questions],
                 expected_duration=expected_duration,
             )
             session.add(test)
@@ -128,7 +128,7 @@ async def generate_task(request: GenerateTaskRequest) -> GenerateTaskResponse:
                         test_id=task_id,
                         topic=request.topic,
                         difficulty=request.difficulty,
-                        questions=json.dumps([task.dict()]),
+                        questions=[task.dict()],
                         expected_duration=10,
                     )
                     session.add(test)
@@ -169,7 +169,7 @@ async def submit_test_for_verification(request: SubmitTestRequest) -> SubmitTest
 
     with get_db_session() as session:
         test_result = TestResult(
-            test_id=request.test_id, user_id=request.user_id, answers=json.dumps(request.answers)
+            test_id=request.test_id, user_id=request.user_id, answers=request.answers
         )
         session.add(test_result)
 
@@ -190,7 +190,7 @@ async def get_test(test_id: str) -> GetTestResponse:
                 "test_id": test.test_id,
                 "topic": test.topic,
                 "difficulty": test.difficulty,
-                "questions": json.loads(test.questions),
+                "questions": test.questions,
                 "expected_duration": test.expected_duration,
             },
             metadata={"created_at": test.created_at.isoformat()},
@@ -1,9 +1,11 @@
+import asyncio
 import json
 import uuid
 
 from fastapi import APIRouter, HTTPException
 
 from ..agents.registry import load_agent
+from ..config import get_settings
 from ..core.database import Verification, get_db_session
 from ..models.schemas import (
     GetVerificationHistoryResponse,
@@ -23,13 +25,35 @@ async def check_test(request: TestVerificationRequest) -> TestVerificationRespon
         user_id = "unknown"
         verification_id = str(uuid.uuid4())
 
+        settings = get_settings()
+        parallel_verification = (
+            request.secondary_check and settings.features.feature_parallel_verification_enabled
+        )
+
         # Первичная проверка - теперь возвращает {"verdict": true/false}
         primary_agent = load_agent("verification", language=request.language)
-        primary_result = await primary_agent.ainvoke({
+        primary_input = {
             "question": request.question,
             "expected_answer": request.expected_answer or "",
             "user_answer": request.user_answer,
-        })
+        }
+
+        secondary_result: str | None = None
+        if parallel_verification:
+            # Обе проверки независимы по данным: вторичная получает маркер
+            # "parallel" вместо первичного вердикта, поэтому их можно
+            # запустить одновременно и сэкономить один полный RTT до LLM.
+            secondary_agent = load_agent("verification-secondary", language=request.language)
+            primary_result, secondary_result = await asyncio.gather(
+                primary_agent.ainvoke(primary_input),
+                secondary_agent.ainvoke({
+                    "primary_verdict": "parallel",
+                    "question": request.question,
+                    "user_answer": request.user_answer,
+                }),
+            )
+        else:
+            primary_result = await primary_agent.ainvoke(primary_input)
 
         try:
             primary_eval = json.loads(primary_result)
@@ -50,18 +74,31 @@ async def check_test(request: TestVerificationRequest) -> TestVerificationRespon
         # Вторичная проверка
         secondary_eval = None
         if request.secondary_check:
-            secondary_agent = load_agent("verification-secondary", language=request.language)
-            secondary_result = await secondary_agent.ainvoke({
-                "primary_verdict": primary_verdict,  # Передаем только булево значение
-                "question": request.question,
-                "user_answer": request.user_answer,
-            })
+            if secondary_result is None:
+                # Последовательный режим: вторичная проверка видит первичный вердикт.
+                secondary_agent = load_agent("verification-secondary", language=request.language)
+                secondary_result = await secondary_agent.ainvoke({
+                    "primary_verdict": primary_verdict,  # Передаем только булево значение
+                    "question": request.question,
+                    "user_answer": request.user_answer,
+                })
 
             try:
                 secondary_eval = json.loads(secondary_result)
             except json.JSONDecodeError:
                 raise HTTPException(status_code=500, detail="Failed to parse secondary evaluation")
 
+            if parallel_verification and secondary_eval is not None:
+                # В параллельном режиме вторичная проверка не видела первичный
+                # вердикт, поэтому согласие вычисляем при сверке результатов.
+                secondary_verdict = secondary_eval.get(
+                    "verdict", secondary_eval.get("is_correct")
+                )
+                if secondary_verdict is not None:
+                    secondary_eval["agree_with_primary"] = bool(secondary_verdict) == bool(
+                        primary_verdict
+                    )
+
         # Финальные значения (если есть вторичная проверка, берем от нее)
         if secondary_eval:
             # Ожидаем формат: {"agree_with_primary": bool, "verdict": bool, "feedback": str, ...}
@@ -6,7 +6,7 @@ Code from Section 7.1 of architecture.
 import logging
 import time
 from typing import Any
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlparse
 
 import aiohttp
 
@@ -51,20 +51,21 @@ class WebSearchTool(BaseTool):
         # Fallback instances from settings
         self.fallback_urls = self.settings.web_search.web_search_fallback_urls
 
-        # Domain priorities
+        # Domain priorities (single settings map → URL substring keys)
+        priorities = self.settings.web_search.web_search_priorities
         self.domain_priorities = {
-            ".edu": self.settings.web_search.web_search_priority_edu,
-            ".org": self.settings.web_search.web_search_priority_org,
-            ".gov": self.settings.web_search.web_search_priority_gov,
-            "wikipedia.org": self.settings.web_search.web_search_priority_wiki,
-            "habr.com": self.settings.web_search.web_search_priority_habr,
-            "stackoverflow.com": self.settings.web_search.web_search_priority_stackoverflow,
-            ".com": self.settings.web_search.web_search_priority_com,
-            ".ru": self.settings.web_search.web_search_priority_ru,
+            ".edu": priorities.get("edu", 1.0),
+            ".org": priorities.get("org", 1.0),
+            ".gov": priorities.get("gov", 1.0),
+            "wikipedia.org": priorities.get("wiki", 1.0),
+            "habr.com": priorities.get("habr", 1.0),
+            "stackoverflow.com": priorities.get("stackoverflow", 1.0),
+            ".com": priorities.get("com", 1.0),
+            ".ru": priorities.get("ru", 1.0),
         }
 
-        # Blacklist
-        self.blacklist = set(self.settings.web_search.web_search_blacklist)
+        # Blacklist (precompiled frozenset + suffix tuple on the settings side)
+        self.blacklist = self.settings.web_search.blacklist_set
 
         logger.info("🔍 Web Search Tool initialized:")
         logger.info(f"   - Primary: {self.primary_url}")
@@ -121,8 +122,9 @@ class WebSearchTool(BaseTool):
         for result in search_results:
             url = result.get("url", "")
 
-            # Check blacklist
-            if any(bl in url for bl in self.blacklist):
+            # Check blacklist (hashed host lookup instead of substring scans)
+            host = urlparse(url).netloc
+            if self.settings.web_search.is_blacklisted(host):
                 logger.debug(f"⛔ Blacklisted: {url}")
                 continue
 